@@ -8,13 +8,20 @@ The AWS CRT client provides enhanced performance through its optimized implement
 
 import os
 import time
+import asyncio
 import uuid
 import boto3
 import logging
+import itertools
 import threading
-import statistics
+import functools
+import concurrent.futures
+import botocore.session
 from datetime import datetime
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from s3transfer.subscribers import BaseSubscriber
 
 # Configure logging
 logging.basicConfig(
@@ -30,22 +37,59 @@ S3_BUCKET = f"s3-crt-test-{UNIQUE_ID}"
 TEST_FILE = "test.zip"
 LOCAL_PATH = os.path.abspath(TEST_FILE)
 S3_PREFIX = "crt-test"
+# Route transfers through S3 Transfer Acceleration; set USE_ACCELERATE=0 for same-region runs
+USE_ACCELERATE = os.environ.get('USE_ACCELERATE', '1').lower() not in ('0', 'false', 'no')
+CRT_PART_SIZE = 16 * 1024 * 1024  # 16 MB parts for the native CRT client
+CRT_THROUGHPUT_TARGET_GBPS = 100.0  # Let the CRT open as many connections as the NIC allows
+MULTIPART_THRESHOLD = 64 * 1024 * 1024  # 64 MB
+MULTIPART_CHUNKSIZE = 64 * 1024 * 1024  # 64 MB chunks
+MAX_CONCURRENCY = 32
+IO_CHUNKSIZE = 1 * 1024 * 1024  # 1 MB, same as the AWS CLI
+TARGET_PART_COUNT = 1000  # Keeps large files far below the 10,000 part S3 limit
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024  # 5 GB, the largest part S3 accepts
+PROGRESS_PRINT_STRIDE = 64 * 1024 * 1024  # Print progress every 64 MB
+SHOW_PROGRESS = not os.environ.get('S3_NO_PROGRESS')  # Set S3_NO_PROGRESS=1 to skip per-chunk callbacks
+ASYNC_MAX_IN_FLIGHT = 64  # S3 starts throttling very high fan-out from one client
+MAX_POOL_CONNECTIONS = 64
+TRANSFER_CLIENT_COUNT = 8  # Independent pools spread range GETs across more S3 front ends
+# Workers are spread round-robin over the clients, so each pool only needs its share of MAX_CONCURRENCY
+TRANSFER_CLIENT_POOL_CONNECTIONS = -(-MAX_CONCURRENCY // TRANSFER_CLIENT_COUNT)  # Ceiling division
 
-# Check if boto3 has CRT support
+# Check if the AWS CRT is installed
 try:
-    from boto3.s3.transfer import TransferConfig
-    from botocore.config import Config
+    import awscrt.auth
+    import awscrt.io
+    import awscrt.s3
+    from s3transfer.crt import BotocoreCRTRequestSerializer, CRTTransferManager
     CRT_AVAILABLE = True
     logger.info("AWS CRT support is available")
 except ImportError:
     CRT_AVAILABLE = False
     logger.warning("AWS CRT support is not available. Install with: pip install 'boto3[crt]'")
 
+# Check if aioboto3 is installed
+try:
+    import aioboto3
+    AIOBOTO3_AVAILABLE = True
+except ImportError:
+    AIOBOTO3_AVAILABLE = False
+    logger.warning("aioboto3 is not available, falling back to threaded range downloads. Install with: pip install aioboto3")
+
+# Create AWS clients once so every helper shares a warm keep-alive connection pool
+s3_client = boto3.client('s3', config=Config(
+    region_name=REGION,
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    retries={
+        'max_attempts': 10,
+        'mode': 'standard'
+    }
+))
+
 def create_bucket():
     """Create S3 bucket for testing"""
     try:
-        logger.info(f"Creating S3 bucket: {S3_BUCKET}")
-        s3_client = boto3.client('s3', region_name=REGION)
+        logger.info("Creating S3 bucket: %s", S3_BUCKET)
         if REGION == 'us-east-1':
             s3_client.create_bucket(Bucket=S3_BUCKET)
         else:
@@ -53,175 +97,262 @@ def create_bucket():
                 Bucket=S3_BUCKET,
                 CreateBucketConfiguration={'LocationConstraint': REGION}
             )
+        
+        if USE_ACCELERATE:
+            # Enable Transfer Acceleration
+            logger.info("Enabling Transfer Acceleration on bucket: %s", S3_BUCKET)
+            s3_client.put_bucket_accelerate_configuration(
+                Bucket=S3_BUCKET,
+                AccelerateConfiguration={'Status': 'Enabled'}
+            )
+            
+            # Wait for acceleration to be enabled
+            logger.info("Waiting for Transfer Acceleration to be enabled...")
+            time.sleep(10)  # Give some time for the configuration to propagate
+        
         return S3_BUCKET
     except ClientError as e:
-        logger.error(f"Error creating bucket: {e}")
+        logger.error("Error creating bucket: %s", e)
         raise
 
-def create_crt_client():
-    """Create an S3 client with CRT enabled"""
-    # Create a boto3 client with CRT enabled
-    s3_config = Config(
+def get_client_config():
+    """Get the botocore configuration shared by the CRT and fallback clients"""
+    return Config(
         region_name=REGION,
         signature_version='s3v4',
+        # The pool must be at least as large as the transfer concurrency,
+        # otherwise workers stall waiting for a free connection
+        max_pool_connections=max(MAX_POOL_CONNECTIONS, MAX_CONCURRENCY * 2),
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=60,
         retries={
             'max_attempts': 10,
             'mode': 'standard'
         },
         s3={
-            'use_accelerate_endpoint': False,
+            'use_accelerate_endpoint': USE_ACCELERATE,
             'addressing_style': 'virtual',
             'payload_signing_enabled': False,
-            'use_dualstack_endpoint': False,
+            'use_dualstack_endpoint': USE_ACCELERATE,
             'use_arn_region': False,
             'us_east_1_regional_endpoint': 'regional'
         }
     )
+
+@functools.lru_cache(maxsize=None)
+def get_transfer_client():
+    """Get the boto3 client used when the CRT is not installed"""
+    return boto3.client('s3', config=get_client_config())
+
+def build_transfer_config(file_size):
+    """Build the fallback transfer configuration for a file of the given size"""
+    # Grow the chunks for very large files so the number of parts stays bounded
+    chunksize = min(max(MULTIPART_CHUNKSIZE, file_size // TARGET_PART_COUNT), MAX_PART_SIZE)
+    
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=chunksize,
+        max_concurrency=MAX_CONCURRENCY,
+        use_threads=True,
+        io_chunksize=IO_CHUNKSIZE
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_transfer_clients():
+    """Get a set of boto3 clients, each with its own connection pool"""
+    config = get_client_config().merge(Config(max_pool_connections=TRANSFER_CLIENT_POOL_CONNECTIONS))
+    return tuple(boto3.client('s3', config=config) for _ in range(TRANSFER_CLIENT_COUNT))
+
+@functools.lru_cache(maxsize=None)
+def get_crt_s3_client():
+    """Return the shared native CRT S3 client, built with its event loop and resolver on first use"""
+    # The CRT runs its own event loop threads, so the transfer never touches the GIL
+    event_loop_group = awscrt.io.EventLoopGroup(os.cpu_count())
+    host_resolver = awscrt.io.DefaultHostResolver(event_loop_group)
+    bootstrap = awscrt.io.ClientBootstrap(event_loop_group, host_resolver)
+    credential_provider = awscrt.auth.AwsCredentialsProvider.new_default_chain(bootstrap)
+    
+    return awscrt.s3.S3Client(
+        bootstrap=bootstrap,
+        region=REGION,
+        credential_provider=credential_provider,
+        part_size=CRT_PART_SIZE,
+        throughput_target_gbps=CRT_THROUGHPUT_TARGET_GBPS
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_crt_request_serializer():
+    """Return a cached request serializer for the CRT transfer manager"""
+    # botocore is only used to serialize the requests handed to the CRT
+    return BotocoreCRTRequestSerializer(
+        botocore.session.Session(),
+        {'region_name': REGION, 'config': get_client_config()}
+    )
+
+def create_crt_client():
+    """Create a transfer manager backed by the native AWS CRT S3 client"""
+    # The manager itself is cheap, the CRT client and its warm connections are shared between transfers
+    return CRTTransferManager(get_crt_s3_client(), get_crt_request_serializer())
+
+def make_progress_callback(total_size, label, start_time):
+    """Create a progress callback that prints once per PROGRESS_PRINT_STRIDE bytes"""
+    # Closure cells are cheaper to reach than instance attributes on the hot path
+    lock = threading.Lock()
+    print_lock = threading.Lock()
+    stride = PROGRESS_PRINT_STRIDE
+    seen_so_far = 0
+    next_print = stride
+    
+    def progress(bytes_amount):
+        nonlocal seen_so_far, next_print
+        
+        # Hold the counter lock only for the increment itself
+        with lock:
+            seen_so_far += bytes_amount
+            seen = seen_so_far
+        
+        # Update status once per stride of transferred bytes
+        if seen < next_print:
+            return
+        
+        # Only one thread prints at a time, the others drop through
+        if not print_lock.acquire(blocking=False):
+            return
+        try:
+            next_print = seen - seen % stride + stride
+            percentage = (seen / total_size) * 100
+            elapsed = time.time() - start_time
+            speed = seen / (1024 * 1024 * elapsed) if elapsed > 0 else 0
+            
+            print(f"\r[{label}] Progress: {seen}/{total_size} bytes "
+                  f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
+        finally:
+            print_lock.release()
     
-    # Create the client with CRT enabled
-    return boto3.client('s3', config=s3_config)
+    return progress
 
-def s3_crt_upload():
+class ProgressSubscriber(BaseSubscriber):
+    """Forward CRT transfer progress to a plain progress callback"""
+    def __init__(self, callback):
+        self._callback = callback
+        
+    def on_progress(self, bytes_transferred, **kwargs):
+        self._callback(bytes_transferred)
+
+def s3_crt_upload(file_size):
     """Perform an upload using S3 CRT client"""
-    file_size = os.path.getsize(TEST_FILE)
     start_time = time.time()
     
     try:
-        logger.info(f"Starting S3 CRT upload of {TEST_FILE} ({file_size / (1024**2):.2f} MB)")
+        logger.info("Starting S3 CRT upload of %s (%.2f MB)", TEST_FILE, file_size / (1024**2))
         
-        # Create a callback class to track upload progress
-        class ProgressPercentage(object):
-            def __init__(self, filename):
-                self._filename = filename
-                self._size = float(os.path.getsize(filename))
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
-                
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[S3 CRT UPLOAD] Progress: {self._seen_so_far}/{self._size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
+        # Ask the kernel to start reading the file ahead of the upload workers
+        advise_file(TEST_FILE, 'POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED')
         
-        # Configure the transfer with optimized settings for CRT
-        transfer_config = TransferConfig(
-            multipart_threshold=8 * 1024 * 1024,  # 8 MB
-            max_concurrency=20,  # Higher concurrency for CRT
-            multipart_chunksize=16 * 1024 * 1024,  # 16 MB chunks
-            use_threads=True
-        )
+        # Track upload progress unless it has been switched off
+        progress = make_progress_callback(file_size, "S3 CRT UPLOAD", start_time) if SHOW_PROGRESS else None
         
-        # Create CRT-enabled client
-        s3_client = create_crt_client()
-        
-        # Use the CRT client to upload the file
-        s3_client.upload_file(
-            TEST_FILE, 
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}",
-            Config=transfer_config,
-            Callback=ProgressPercentage(TEST_FILE)
-        )
+        if CRT_AVAILABLE:
+            # Pass the path rather than a file object so the CRT reads the
+            # file natively instead of pulling every part through Python bytes
+            with create_crt_client() as transfer_manager:
+                future = transfer_manager.upload(
+                    TEST_FILE,
+                    S3_BUCKET,
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    subscribers=[ProgressSubscriber(progress)] if progress else []
+                )
+                future.result()
+        else:
+            # Configure the transfer with optimized settings
+            transfer_config = build_transfer_config(file_size)
+            
+            # Fall back to the s3transfer thread pool. upload_file streams each
+            # part from its own file handle, whereas upload_fileobj would read
+            # whole parts into memory first
+            get_transfer_client().upload_file(
+                TEST_FILE, 
+                S3_BUCKET, 
+                f"{S3_PREFIX}/{TEST_FILE}",
+                Config=transfer_config,
+                Callback=progress
+            )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
         duration = end_time - start_time
         throughput = file_size / (1024 * 1024 * duration)
         
-        logger.info(f"S3 CRT upload completed in {duration:.2f} seconds")
-        logger.info(f"Throughput: {throughput:.2f} MB/s")
+        logger.info("S3 CRT upload completed in %.2f seconds", duration)
+        logger.info("Throughput: %.2f MB/s", throughput)
         
         return {
             'duration': duration,
             'throughput': throughput
         }
     except ClientError as e:
-        logger.error(f"Error during S3 CRT upload: {e}")
+        logger.error("Error during S3 CRT upload: %s", e)
         raise
 
-def s3_crt_download():
+def ensure_object_in_s3(key):
+    """Get the size of an object, uploading the test file first if it is missing"""
+    try:
+        response = s3_client.head_object(Bucket=S3_BUCKET, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] not in ('404', 'NoSuchKey'):
+            raise
+        logger.info("File %s not found in S3, uploading first", TEST_FILE)
+        s3_client.upload_file(TEST_FILE, S3_BUCKET, key)
+        response = s3_client.head_object(Bucket=S3_BUCKET, Key=key)
+    return response['ContentLength']
+
+def s3_crt_download(key, file_size):
     """Perform a download using S3 CRT client"""
-    # First ensure the file exists in S3
-    s3_client = boto3.client('s3', region_name=REGION)
-    if not object_exists_in_s3(S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}"):
-        logger.info(f"File {TEST_FILE} not found in S3, uploading first")
-        s3_client.upload_file(TEST_FILE, S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}")
-    
-    # Get file size
-    response = s3_client.head_object(Bucket=S3_BUCKET, Key=f"{S3_PREFIX}/{TEST_FILE}")
-    file_size = response['ContentLength']
-    
     # Download file
     download_path = f"downloaded_crt_{TEST_FILE}"
     start_time = time.time()
     
     try:
-        logger.info(f"Starting S3 CRT download to {download_path} ({file_size / (1024**2):.2f} MB)")
+        logger.info("Starting S3 CRT download to %s (%.2f MB)", download_path, file_size / (1024**2))
         
-        # Create a callback class to track download progress
-        class ProgressPercentage(object):
-            def __init__(self, total_size):
-                self._total_size = total_size
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
-                
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._total_size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[S3 CRT DOWNLOAD] Progress: {self._seen_so_far}/{self._total_size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
+        # Track download progress unless it has been switched off
+        progress = make_progress_callback(file_size, "S3 CRT DOWNLOAD", start_time) if SHOW_PROGRESS else None
         
-        # Configure the transfer with optimized settings for CRT
-        transfer_config = TransferConfig(
-            multipart_threshold=8 * 1024 * 1024,  # 8 MB
-            max_concurrency=20,  # Higher concurrency for CRT
-            multipart_chunksize=16 * 1024 * 1024,  # 16 MB chunks
-            use_threads=True
-        )
-        
-        # Create CRT-enabled client
-        s3_client = create_crt_client()
-        
-        # Use the CRT client to download the file
-        s3_client.download_file(
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}", 
-            download_path,
-            Config=transfer_config,
-            Callback=ProgressPercentage(file_size)
-        )
+        if CRT_AVAILABLE:
+            # Use the native CRT client to download the file
+            with create_crt_client() as transfer_manager:
+                future = transfer_manager.download(
+                    S3_BUCKET,
+                    key,
+                    download_path,
+                    subscribers=[ProgressSubscriber(progress)] if progress else []
+                )
+                future.result()
+        elif AIOBOTO3_AVAILABLE:
+            # Fan the range GETs out on a single event loop
+            asyncio.run(async_range_download(
+                key,
+                download_path,
+                file_size,
+                callback=progress
+            ))
+        else:
+            # Fall back to explicit parallel range GETs
+            parallel_range_download(
+                key,
+                download_path,
+                file_size,
+                callback=progress
+            )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
         duration = end_time - start_time
         throughput = file_size / (1024 * 1024 * duration)
         
-        logger.info(f"S3 CRT download completed in {duration:.2f} seconds")
-        logger.info(f"Throughput: {throughput:.2f} MB/s")
+        logger.info("S3 CRT download completed in %.2f seconds", duration)
+        logger.info("Throughput: %.2f MB/s", throughput)
         
         # Clean up downloaded file
         os.remove(download_path)
@@ -231,34 +362,152 @@ def s3_crt_download():
             'throughput': throughput
         }
     except ClientError as e:
-        logger.error(f"Error during S3 CRT download: {e}")
+        logger.error("Error during S3 CRT download: %s", e)
         raise
 
-def object_exists_in_s3(bucket, key):
-    """Check if an object exists in S3"""
+def advise_file(path, *advice):
+    """Pass posix_fadvise access hints covering the whole file to the kernel"""
+    # posix_fadvise is not available on macOS or Windows
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    fd = os.open(path, os.O_RDONLY)
     try:
-        s3_client = boto3.client('s3', region_name=REGION)
-        s3_client.head_object(Bucket=bucket, Key=key)
-        return True
-    except ClientError as e:
-        return False
+        for name in advice:
+            os.posix_fadvise(fd, 0, 0, getattr(os, name))
+    finally:
+        os.close(fd)
+
+def preallocate_file(path, size):
+    """Create a file of the given size with its blocks reserved up front"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if size > 0 and hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            # posix_fallocate is not available on macOS
+            os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+
+def get_byte_ranges(file_size):
+    """Split an object into inclusive (start, end) byte ranges"""
+    return [
+        (start, min(start + MULTIPART_CHUNKSIZE, file_size) - 1)
+        for start in range(0, file_size, MULTIPART_CHUNKSIZE)
+    ]
+
+def make_cpu_pinning_initializer():
+    """Create a thread initializer that pins each worker to its own CPU"""
+    # CPU affinity is only available on Linux
+    if not hasattr(os, 'sched_setaffinity'):
+        return None
+    
+    # Leave the first CPU to the main thread and the progress callbacks
+    cpus = sorted(os.sched_getaffinity(0))
+    worker_cpus = cpus[1:] or cpus
+    next_worker = itertools.count()
+    
+    def pin_worker():
+        os.sched_setaffinity(0, {worker_cpus[next(next_worker) % len(worker_cpus)]})
+    
+    return pin_worker
+
+def parallel_range_download(key, download_path, file_size, callback=None):
+    """Download an object with concurrent range GETs written straight to disk"""
+    clients = get_transfer_clients()
+    ranges = get_byte_ranges(file_size)
+    
+    # Reserve the whole file up front so every range is written in place
+    preallocate_file(download_path, file_size)
+    fd = os.open(download_path, os.O_WRONLY)
+    
+    def download_range(index, start, end):
+        # Round-robin the ranges so each client pool holds its own set of connections
+        s3 = clients[index % len(clients)]
+        response = s3.get_object(Bucket=S3_BUCKET, Key=key, Range=f"bytes={start}-{end}")
+        data = response['Body'].read()
+        
+        # pwrite carries its own offset, so workers can share one descriptor
+        os.pwrite(fd, data, start)
+        if callback:
+            callback(len(data))
+    
+    try:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENCY,
+            initializer=make_cpu_pinning_initializer()
+        ) as executor:
+            futures = [
+                executor.submit(download_range, index, start, end)
+                for index, (start, end) in enumerate(ranges)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+    finally:
+        os.close(fd)
+
+async def async_range_download(key, download_path, file_size, callback=None):
+    """Download an object with concurrent range GETs on an asyncio event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+    
+    # Reserve the whole file up front so every range is written in place
+    preallocate_file(download_path, file_size)
+    fd = os.open(download_path, os.O_WRONLY)
+    
+    try:
+        session = aioboto3.Session()
+        async with session.client('s3', config=get_client_config()) as s3:
+            async def download_range(start, end):
+                async with semaphore:
+                    response = await s3.get_object(Bucket=S3_BUCKET, Key=key, Range=f"bytes={start}-{end}")
+                    async with response['Body'] as stream:
+                        data = await stream.read()
+                
+                # Keep the disk write off the event loop thread
+                await loop.run_in_executor(None, os.pwrite, fd, data, start)
+                if callback:
+                    callback(len(data))
+            
+            await asyncio.gather(*[download_range(start, end) for start, end in get_byte_ranges(file_size)])
+    finally:
+        os.close(fd)
 
 def clean_up(bucket):
     """Clean up all created resources"""
     logger.info("Starting cleanup...")
     
-    # Delete objects in S3 bucket
+    # Delete objects in S3 bucket, one DeleteObjects call per page of 1000 keys
     try:
-        s3 = boto3.resource('s3')
-        bucket_obj = s3.Bucket(bucket)
-        bucket_obj.objects.all().delete()
-        logger.info(f"Deleted all objects in bucket: {bucket}")
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket):
+            if 'Contents' in page:
+                s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={
+                        'Objects': [{'Key': obj['Key']} for obj in page['Contents']],
+                        'Quiet': True
+                    }
+                )
+        logger.info("Deleted all objects in bucket: %s", bucket)
+        
+        # Abort unfinished multipart uploads, their parts are still billed
+        paginator = s3_client.get_paginator('list_multipart_uploads')
+        for page in paginator.paginate(Bucket=bucket):
+            for upload in page.get('Uploads', []):
+                s3_client.abort_multipart_upload(
+                    Bucket=bucket,
+                    Key=upload['Key'],
+                    UploadId=upload['UploadId']
+                )
+        logger.info("Aborted incomplete multipart uploads in bucket: %s", bucket)
         
         # Delete the bucket
-        bucket_obj.delete()
-        logger.info(f"Deleted bucket: {bucket}")
+        s3_client.delete_bucket(Bucket=bucket)
+        logger.info("Deleted bucket: %s", bucket)
     except ClientError as e:
-        logger.error(f"Error cleaning up S3 resources: {e}")
+        logger.error("Error cleaning up S3 resources: %s", e)
 
 def run_tests():
     """Run all performance tests"""
@@ -272,27 +521,32 @@ def run_tests():
     try:
         # Verify test file exists
         if not os.path.exists(TEST_FILE):
-            logger.error(f"Test file {TEST_FILE} not found. Please ensure it exists in the current directory.")
+            logger.error("Test file %s not found. Please ensure it exists in the current directory.", TEST_FILE)
             return
         
         file_size = os.path.getsize(TEST_FILE)
-        logger.info(f"Using test file: {TEST_FILE} ({file_size / (1024**3):.2f} GB)")
+        logger.info("Using test file: %s (%.2f GB)", TEST_FILE, file_size / (1024**3))
         
         # Create S3 bucket
         bucket = create_bucket()
         
-        # Run S3 CRT tests
-        logger.info("\n=== S3 CRT Upload Test ===")
-        results['s3_crt_upload'].append(s3_crt_upload())
+        # Give the download test its own object so it does not race the upload
+        download_key = f"{S3_PREFIX}/download-{TEST_FILE}"
+        download_size = ensure_object_in_s3(download_key)
         
-        logger.info("\n=== S3 CRT Download Test ===")
-        results['s3_crt_download'].append(s3_crt_download())
+        # Run S3 CRT upload and download tests side by side
+        logger.info("\n=== S3 CRT Upload and Download Tests ===")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            upload_future = executor.submit(s3_crt_upload, file_size)
+            download_future = executor.submit(s3_crt_download, download_key, download_size)
+            results['s3_crt_upload'].append(upload_future.result())
+            results['s3_crt_download'].append(download_future.result())
         
         # Generate summary report
         generate_report(results, file_size)
         
     except Exception as e:
-        logger.error(f"An error occurred during testing: {e}")
+        logger.error("An error occurred during testing: %s", e)
     finally:
         # Clean up resources
         if bucket:
@@ -304,10 +558,29 @@ def generate_report(results, file_size):
     
     # Helper function to calculate averages
     def calculate_averages(test_results):
-        durations = [result['duration'] for result in test_results if result is not None]
-        throughputs = [result['throughput'] for result in test_results if result is not None]
+        count = 0
+        total_duration = 0.0
+        total_throughput = 0.0
+        min_duration = 0
+        max_throughput = 0
+        
+        # Fold the sums and extremes into a single pass over the results
+        for result in test_results:
+            if result is None:
+                continue
+            duration = result['duration']
+            throughput = result['throughput']
+            if count == 0:
+                min_duration = duration
+                max_throughput = throughput
+            else:
+                min_duration = min(min_duration, duration)
+                max_throughput = max(max_throughput, throughput)
+            total_duration += duration
+            total_throughput += throughput
+            count += 1
         
-        if not durations:
+        if not count:
             return {
                 'avg_duration': 0,
                 'avg_throughput': 0,
@@ -316,10 +589,10 @@ def generate_report(results, file_size):
             }
         
         return {
-            'avg_duration': statistics.mean(durations),
-            'avg_throughput': statistics.mean(throughputs),
-            'min_duration': min(durations),
-            'max_throughput': max(throughputs)
+            'avg_duration': total_duration / count,
+            'avg_throughput': total_throughput / count,
+            'min_duration': min_duration,
+            'max_throughput': max_throughput
         }
     
     # Calculate averages for each test type
@@ -328,13 +601,13 @@ def generate_report(results, file_size):
         averages[test_name] = calculate_averages(test_results)
     
     # Print test results
-    logger.info(f"FILE SIZE: {file_size / (1024**3):.2f} GB")
-    logger.info(f"{'Test Type':<30} {'Avg Duration (s)':<20} {'Avg Throughput (MB/s)':<20}")
+    logger.info("FILE SIZE: %.2f GB", file_size / (1024**3))
+    logger.info("%-30s %-20s %-20s", 'Test Type', 'Avg Duration (s)', 'Avg Throughput (MB/s)')
     logger.info("-" * 70)
     
     for test_name in ['s3_crt_upload', 's3_crt_download']:
         avg = averages[test_name]
-        logger.info(f"{test_name:<30} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f}")
+        logger.info("%-30s %-20.2f %-20.2f", test_name, avg['avg_duration'], avg['avg_throughput'])
        
     s3_crt_upload_speed = averages['s3_crt_upload']['avg_throughput']
     s3_crt_download_speed = averages['s3_crt_download']['avg_throughput']
@@ -343,14 +616,14 @@ def generate_report(results, file_size):
         upload_improvement_s3 = ((s3_crt_upload_speed - 8.63) / 8.63) * 100
         upload_improvement_tm = ((s3_crt_upload_speed - 4.68) / 4.68) * 100
         upload_comparison_datasync = ((s3_crt_upload_speed - 15.00) / 15.00) * 100
-        logger.info(f"\nS3 CRT upload speed: {s3_crt_upload_speed:.2f} MB/s")
+        logger.info("\nS3 CRT upload speed: %.2f MB/s", s3_crt_upload_speed)
 
     
     if s3_crt_download_speed > 0:
         download_improvement_s3 = ((s3_crt_download_speed - 9.62) / 9.62) * 100
         download_improvement_tm = ((s3_crt_download_speed - 7.26) / 7.26) * 100
         download_comparison_datasync = ((s3_crt_download_speed - 18.00) / 18.00) * 100
-        logger.info(f"\nS3 CRT download speed: {s3_crt_download_speed:.2f} MB/s")
+        logger.info("\nS3 CRT download speed: %.2f MB/s", s3_crt_download_speed)
 
     
     logger.info("\n=== END OF REPORT ===\n")
@@ -7,16 +7,22 @@ but without using Transfer Acceleration to avoid additional costs.
 """
 
 import os
+import mmap
 import time
+import asyncio
+import queue
 import uuid
 import boto3
 import logging
 import threading
-import statistics
+import functools
+import concurrent.futures
+import botocore.session
 from datetime import datetime
 from botocore.exceptions import ClientError
 from botocore.config import Config
 from boto3.s3.transfer import TransferConfig
+from s3transfer.subscribers import BaseSubscriber
 
 # Configure logging
 logging.basicConfig(
@@ -27,42 +33,82 @@ logger = logging.getLogger(__name__)
 
 # Constants
 REGION = 'us-east-1'  # Change to your preferred region
-UNIQUE_ID = str(uuid.uuid4())[:8]
-S3_BUCKET = f"s3-optimized-test-{UNIQUE_ID}"
 TEST_FILE = "test.zip"
 LOCAL_PATH = os.path.abspath(TEST_FILE)
 S3_PREFIX = "optimized-test"
+# Set ALLOW_PLAINTEXT_S3=1 to skip TLS for intra-region test traffic, never over the internet
+ALLOW_PLAINTEXT_S3 = os.environ.get('ALLOW_PLAINTEXT_S3') == '1'
+S3_ENDPOINT_HOST = f"s3.{REGION}.amazonaws.com"  # Regional endpoint, skips the resolver on every request
 TEST_ITERATIONS = 1  # Number of test iterations
+ASYNC_MAX_CONCURRENCY = 32  # In-flight range requests when using aioboto3
+# Threaded range downloads: request workers + queued bodies + write workers each hold a pooled connection
+RANGE_REQUEST_WORKERS = 8
+RANGE_QUEUE_DEPTH = 16
+RANGE_WRITE_WORKERS = 20
+DOWNLOAD_MAX_CONCURRENCY = 20  # TransferConfig threads for optimized_download
+# Both downloads run at once on the shared client, so its pool has to hold both
+MAX_POOL_CONNECTIONS = RANGE_REQUEST_WORKERS + RANGE_QUEUE_DEPTH + RANGE_WRITE_WORKERS + DOWNLOAD_MAX_CONCURRENCY
+CRT_PART_SIZE = 25 * 1024 * 1024  # 25 MB fixed parts for the shared CRT client, TransferConfig chunks follow get_auto_chunk_size
+CRT_MULTIPART_THRESHOLD = 25 * 1024 * 1024  # 25 MB
+CRT_THROUGHPUT_TARGET_GBPS = 10.0
+MIN_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB
+MAX_CHUNK_SIZE = 128 * 1024 * 1024  # 128 MB
+TARGET_CHUNK_COUNT = 64  # Enough parts to keep every worker busy, far below the 10,000 part limit
+SMALL_FILE_THRESHOLD = 5 * 1024 * 1024  # Below this a single PUT/GET beats any multipart machinery
+
+# Check if the AWS CRT is installed
+try:
+    import awscrt.auth
+    import awscrt.io
+    import awscrt.s3
+    from s3transfer.crt import BotocoreCRTRequestSerializer, CRTTransferManager
+    CRT_AVAILABLE = True
+except ImportError:
+    CRT_AVAILABLE = False
+    logger.warning("AWS CRT support is not available, transfers will use TransferConfig. Install with: pip install 'boto3[crt]'")
+
+# Check if aioboto3 is installed
+try:
+    import aioboto3
+    AIOBOTO3_AVAILABLE = True
+except ImportError:
+    AIOBOTO3_AVAILABLE = False
+    logger.warning("aioboto3 is not available, range downloads will use threads. Install with: pip install aioboto3")
+
+@functools.lru_cache(maxsize=None)
+def bucket_name():
+    """Return this run's test bucket name, generated on first use"""
+    return f"s3-optimized-test-{uuid.uuid4().hex[:8]}"
 
 def create_bucket():
     """Create S3 bucket for testing"""
     try:
-        logger.info(f"Creating S3 bucket: {S3_BUCKET}")
-        s3_client = boto3.client('s3', region_name=REGION)
+        logger.info(f"Creating S3 bucket: {bucket_name()}")
+        s3_client = get_s3_client(optimized=False)
         
         # Create the bucket
         if REGION == 'us-east-1':
-            s3_client.create_bucket(Bucket=S3_BUCKET)
+            s3_client.create_bucket(Bucket=bucket_name())
         else:
             s3_client.create_bucket(
-                Bucket=S3_BUCKET,
+                Bucket=bucket_name(),
                 CreateBucketConfiguration={'LocationConstraint': REGION}
             )
         
-        return S3_BUCKET
+        return bucket_name()
     except ClientError as e:
         logger.error(f"Error creating bucket: {e}")
         raise
 
-def create_optimized_client():
-    """Create an optimized S3 client with best performance settings"""
-    # Create a boto3 client with optimized settings
-    s3_config = Config(
+def get_optimized_client_config(mode='standard', connect_timeout=3, read_timeout=30):
+    """Get the botocore configuration with best performance settings"""
+    return Config(
         region_name=REGION,
         signature_version='s3v4',
         retries={
-            'max_attempts': 10,
-            'mode': 'adaptive'  # Use adaptive retry mode for better resilience
+            'max_attempts': 5,
+            # Adaptive mode throttles client-side, which only helps PUTs that hit SlowDown
+            'mode': mode
         },
         s3={
             'addressing_style': 'virtual',
@@ -70,82 +116,181 @@ def create_optimized_client():
             'use_dualstack_endpoint': False,
             'us_east_1_regional_endpoint': 'regional'
         },
+        # Only compute or validate CRC checksums where the operation requires them
+        request_checksum_calculation='when_required',
+        response_checksum_validation='when_required',
+        # Range GETs never use host-prefixed operations, so skip that step per request
+        inject_host_prefix=False,
+        # Fail stalled connections fast so the retry gets a fresh one
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        tcp_keepalive=True,
         # Increase max pool connections for better concurrency
-        max_pool_connections=50
+        max_pool_connections=MAX_POOL_CONNECTIONS
+    )
+
+def create_optimized_client(mode='standard', connect_timeout=3, read_timeout=30, use_ssl=not ALLOW_PLAINTEXT_S3):
+    """Create an optimized S3 client with best performance settings"""
+    # Create a boto3 client with optimized settings
+    return boto3.client(
+        's3',
+        use_ssl=use_ssl,
+        # An explicit endpoint_url overrides use_ssl, so its scheme has to match
+        endpoint_url=f"{'https' if use_ssl else 'http'}://{S3_ENDPOINT_HOST}",
+        config=get_optimized_client_config(mode, connect_timeout, read_timeout)
     )
+
+@functools.lru_cache(maxsize=4)
+def get_s3_client(region=REGION, optimized=True, mode='standard'):
+    """Return a shared S3 client so its connection pool survives between calls"""
+    if optimized:
+        return create_optimized_client(mode)
+    return boto3.client('s3', region_name=region)
+
+@functools.lru_cache(maxsize=None)
+def get_crt_s3_client():
+    """Return the shared native CRT S3 client, built with its event loop and resolver on first use"""
+    # TLS, connection multiplexing and part splitting all run on CRT threads outside the GIL
+    event_loop_group = awscrt.io.EventLoopGroup(os.cpu_count())
+    host_resolver = awscrt.io.DefaultHostResolver(event_loop_group)
+    bootstrap = awscrt.io.ClientBootstrap(event_loop_group, host_resolver)
+    credential_provider = awscrt.auth.AwsCredentialsProvider.new_default_chain(bootstrap)
     
-    # Create the client
-    return boto3.client('s3', config=s3_config)
+    return awscrt.s3.S3Client(
+        bootstrap=bootstrap,
+        region=REGION,
+        credential_provider=credential_provider,
+        part_size=CRT_PART_SIZE,
+        multipart_upload_threshold=CRT_MULTIPART_THRESHOLD,
+        throughput_target_gbps=CRT_THROUGHPUT_TARGET_GBPS
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_crt_request_serializer():
+    """Return a cached request serializer for the CRT transfer manager"""
+    # botocore is only used to serialize the requests handed to the CRT
+    return BotocoreCRTRequestSerializer(
+        botocore.session.Session(),
+        {'region_name': REGION, 'config': get_optimized_client_config()}
+    )
+
+def create_crt_transfer_manager():
+    """Create a transfer manager backed by the native AWS CRT S3 client"""
+    # The manager itself is cheap, the CRT client and its connections are shared between transfers
+    return CRTTransferManager(get_crt_s3_client(), get_crt_request_serializer())
+
+class ProgressSubscriber(BaseSubscriber):
+    """Forward CRT transfer progress to a plain progress callback"""
+    def __init__(self, callback):
+        self._callback = callback
+        
+    def on_progress(self, bytes_transferred, **kwargs):
+        self._callback(bytes_transferred)
 
-def get_optimized_transfer_config(for_upload=True):
+class ProgressPercentage(object):
+    """Print transfer progress at most once per second"""
+    def __init__(self, total_size, label, start_time):
+        self._size = total_size
+        self._label = label
+        self._start_time = start_time
+        self._seen_so_far = 0
+        self._lock = threading.Lock()
+        self._print_lock = threading.Lock()
+        self._last_update_time = time.time()
+        self._update_interval = 1.0  # Update every second
+        
+    def __call__(self, bytes_amount):
+        # Hold the counter lock only for the increment itself
+        with self._lock:
+            self._seen_so_far += bytes_amount
+            seen = self._seen_so_far
+        
+        # Check the time gate before touching the print lock, a racy read at worst prints twice
+        current_time = time.time()
+        if current_time - self._last_update_time < self._update_interval:
+            return
+        
+        # Only one thread prints at a time, the others just return
+        if not self._print_lock.acquire(blocking=False):
+            return
+        try:
+            percentage = (seen / self._size) * 100
+            elapsed = current_time - self._start_time
+            speed = seen / (1024 * 1024 * elapsed) if elapsed > 0 else 0
+            
+            print(f"\r[{self._label}] Progress: {seen}/{self._size} bytes "
+                  f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
+            
+            self._last_update_time = current_time
+        finally:
+            self._print_lock.release()
+
+def get_auto_chunk_size(file_size):
+    """Pick a chunk size that splits the file into about TARGET_CHUNK_COUNT parts"""
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, file_size // TARGET_CHUNK_COUNT))
+
+def get_optimized_transfer_config(for_upload=True, file_size=0):
     """Get optimized transfer configuration based on operation type"""
+    chunk_size = get_auto_chunk_size(file_size)
     if for_upload:
-        # For uploads, use slightly lower concurrency but larger chunk size
+        # For uploads, use slightly lower concurrency
         return TransferConfig(
-            multipart_threshold=25 * 1024 * 1024,  # 25 MB
+            multipart_threshold=chunk_size,
             max_concurrency=15,                    # 15 concurrent threads
-            multipart_chunksize=25 * 1024 * 1024,  # 25 MB chunks
+            multipart_chunksize=chunk_size,
             use_threads=True,
             max_bandwidth=None                     # No bandwidth limit
         )
     else:
         # For downloads, use higher concurrency
         return TransferConfig(
-            multipart_threshold=25 * 1024 * 1024,  # 25 MB
-            max_concurrency=20,                    # 20 concurrent threads
-            multipart_chunksize=25 * 1024 * 1024,  # 25 MB chunks
+            multipart_threshold=chunk_size,
+            max_concurrency=DOWNLOAD_MAX_CONCURRENCY,  # 20 concurrent threads
+            multipart_chunksize=chunk_size,
             use_threads=True,
             max_bandwidth=None                     # No bandwidth limit
         )
 
-def optimized_upload():
+def optimized_upload(file_size):
     """Perform an upload using optimized settings"""
-    file_size = os.path.getsize(TEST_FILE)
     start_time = time.time()
     
     try:
         logger.info(f"Starting optimized S3 upload of {TEST_FILE} ({file_size / (1024**2):.2f} MB)")
         
-        # Create a callback class to track upload progress
-        class ProgressPercentage(object):
-            def __init__(self, filename):
-                self._filename = filename
-                self._size = float(os.path.getsize(filename))
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
-                
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[OPTIMIZED UPLOAD] Progress: {self._seen_so_far}/{self._size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
-        
-        # Get optimized transfer config
-        transfer_config = get_optimized_transfer_config(for_upload=True)
-        
-        # Create optimized client
-        s3_client = create_optimized_client()
-        
-        # Use the client to upload the file
-        s3_client.upload_file(
-            TEST_FILE, 
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}",
-            Config=transfer_config,
-            Callback=ProgressPercentage(TEST_FILE)
-        )
+        if file_size < SMALL_FILE_THRESHOLD:
+            # Small files go up in a single PUT with no part splitting
+            with open(TEST_FILE, 'rb') as f:
+                get_s3_client(mode='adaptive').put_object(
+                    Bucket=bucket_name(),
+                    Key=f"{S3_PREFIX}/{TEST_FILE}",
+                    Body=f
+                )
+        elif CRT_AVAILABLE:
+            # Let the native CRT client split and send the parts
+            with create_crt_transfer_manager() as transfer_manager:
+                future = transfer_manager.upload(
+                    TEST_FILE,
+                    bucket_name(),
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    subscribers=[ProgressSubscriber(ProgressPercentage(file_size, 'OPTIMIZED UPLOAD', start_time))]
+                )
+                future.result()
+        else:
+            # Get optimized transfer config
+            transfer_config = get_optimized_transfer_config(for_upload=True, file_size=file_size)
+            
+            # Reuse the shared optimized client, adaptive retries absorb PUT throttling
+            s3_client = get_s3_client(mode='adaptive')
+            
+            # Use the client to upload the file
+            s3_client.upload_file(
+                TEST_FILE, 
+                bucket_name(), 
+                f"{S3_PREFIX}/{TEST_FILE}",
+                Config=transfer_config,
+                Callback=ProgressPercentage(file_size, 'OPTIMIZED UPLOAD', start_time)
+            )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -163,17 +308,11 @@ def optimized_upload():
         logger.error(f"Error during optimized S3 upload: {e}")
         raise
 
-def optimized_download():
+def optimized_download(file_size=None):
     """Perform a download using optimized settings"""
-    # First ensure the file exists in S3
-    standard_s3 = boto3.client('s3', region_name=REGION)
-    if not object_exists_in_s3(S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}"):
-        logger.info(f"File {TEST_FILE} not found in S3, uploading first")
-        standard_s3.upload_file(TEST_FILE, S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}")
-    
-    # Get file size
-    response = standard_s3.head_object(Bucket=S3_BUCKET, Key=f"{S3_PREFIX}/{TEST_FILE}")
-    file_size = response['ContentLength']
+    # Ensure the file exists in S3 and get its size in one HeadObject, unless the caller already knows it
+    if file_size is None:
+        file_size = head_or_upload(f"{S3_PREFIX}/{TEST_FILE}")
     
     # Download file
     download_path = f"downloaded_optimized_{TEST_FILE}"
@@ -182,45 +321,40 @@ def optimized_download():
     try:
         logger.info(f"Starting optimized S3 download to {download_path} ({file_size / (1024**2):.2f} MB)")
         
-        # Create a callback class to track download progress
-        class ProgressPercentage(object):
-            def __init__(self, total_size):
-                self._total_size = total_size
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
-                
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._total_size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[OPTIMIZED DOWNLOAD] Progress: {self._seen_so_far}/{self._total_size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
-        
-        # Get optimized transfer config
-        transfer_config = get_optimized_transfer_config(for_upload=False)
-        
-        # Create optimized client
-        s3_client = create_optimized_client()
-        
-        # Use the client to download the file
-        s3_client.download_file(
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}", 
-            download_path,
-            Config=transfer_config,
-            Callback=ProgressPercentage(file_size)
-        )
+        if file_size < SMALL_FILE_THRESHOLD:
+            # Small files come down in a single GET streamed to disk
+            response = get_s3_client().get_object(
+                Bucket=bucket_name(),
+                Key=f"{S3_PREFIX}/{TEST_FILE}"
+            )
+            with open(download_path, 'wb') as f:
+                for block in response['Body'].iter_chunks(1024 * 1024):
+                    f.write(block)
+        elif CRT_AVAILABLE:
+            # Let the native CRT client fetch the parts
+            with create_crt_transfer_manager() as transfer_manager:
+                future = transfer_manager.download(
+                    bucket_name(),
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    download_path,
+                    subscribers=[ProgressSubscriber(ProgressPercentage(file_size, 'OPTIMIZED DOWNLOAD', start_time))]
+                )
+                future.result()
+        else:
+            # Get optimized transfer config
+            transfer_config = get_optimized_transfer_config(for_upload=False, file_size=file_size)
+            
+            # Reuse the shared optimized client
+            s3_client = get_s3_client()
+            
+            # Use the client to download the file
+            s3_client.download_file(
+                bucket_name(), 
+                f"{S3_PREFIX}/{TEST_FILE}", 
+                download_path,
+                Config=transfer_config,
+                Callback=ProgressPercentage(file_size, 'OPTIMIZED DOWNLOAD', start_time)
+            )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -241,17 +375,11 @@ def optimized_download():
         logger.error(f"Error during optimized S3 download: {e}")
         raise
 
-def optimized_range_download():
+def optimized_range_download(file_size=None):
     """Perform a download using optimized settings with range requests"""
-    # First ensure the file exists in S3
-    standard_s3 = boto3.client('s3', region_name=REGION)
-    if not object_exists_in_s3(S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}"):
-        logger.info(f"File {TEST_FILE} not found in S3, uploading first")
-        standard_s3.upload_file(TEST_FILE, S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}")
-    
-    # Get file size
-    response = standard_s3.head_object(Bucket=S3_BUCKET, Key=f"{S3_PREFIX}/{TEST_FILE}")
-    file_size = response['ContentLength']
+    # Ensure the file exists in S3 and get its size in one HeadObject, unless the caller already knows it
+    if file_size is None:
+        file_size = head_or_upload(f"{S3_PREFIX}/{TEST_FILE}")
     
     # Download file using range requests
     download_path = f"downloaded_range_{TEST_FILE}"
@@ -260,65 +388,114 @@ def optimized_range_download():
     try:
         logger.info(f"Starting optimized range S3 download to {download_path} ({file_size / (1024**2):.2f} MB)")
         
-        # Create optimized client
-        s3_client = create_optimized_client()
-        
         # Calculate chunk size and number of chunks
-        chunk_size = 25 * 1024 * 1024  # 25 MB chunks
+        chunk_size = get_auto_chunk_size(file_size)
         num_chunks = (file_size + chunk_size - 1) // chunk_size  # Ceiling division
         
-        # Create threads for parallel downloads
-        threads = []
         downloaded_bytes = [0]  # Use list for mutable reference in threads
         lock = threading.Lock()
         
-        def download_chunk(chunk_index):
+        def record_progress(chunk_bytes):
+            with lock:
+                downloaded_bytes[0] += chunk_bytes
+                downloaded = downloaded_bytes[0]
+            
+            percentage = (downloaded / file_size) * 100
+            elapsed = time.time() - start_time
+            speed = downloaded / (1024 * 1024 * elapsed) if elapsed > 0 else 0
+            print(f"\r[OPTIMIZED RANGE DOWNLOAD] Progress: {downloaded}/{file_size} bytes "
+                  f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
+        
+        # Bodies whose headers have arrived wait here until a writer is free
+        body_queue = queue.Queue(maxsize=RANGE_QUEUE_DEPTH)
+        write_errors = []
+        
+        def request_chunk(chunk_index):
             start_byte = chunk_index * chunk_size
             end_byte = min(start_byte + chunk_size - 1, file_size - 1)
             
-            # Download the chunk
+            # Only wait for the response headers, the body is read by a writer
             response = s3_client.get_object(
-                Bucket=S3_BUCKET,
+                Bucket=bucket_name(),
                 Key=f"{S3_PREFIX}/{TEST_FILE}",
                 Range=f"bytes={start_byte}-{end_byte}"
             )
-            
-            chunk_data = response['Body'].read()
-            
-            # Write to file at correct position
-            with open(download_path, 'r+b' if os.path.exists(download_path) else 'wb') as f:
-                f.seek(start_byte)
-                f.write(chunk_data)
-            
-            # Update progress
-            with lock:
-                downloaded_bytes[0] += len(chunk_data)
-                percentage = (downloaded_bytes[0] / file_size) * 100
-                elapsed = time.time() - start_time
-                speed = downloaded_bytes[0] / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                print(f"\r[OPTIMIZED RANGE DOWNLOAD] Progress: {downloaded_bytes[0]}/{file_size} bytes "
-                      f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-        
-        # Create file with correct size
-        with open(download_path, 'wb') as f:
-            f.seek(file_size - 1)
-            f.write(b'\0')
-        
-        # Start download threads
-        max_threads = 20  # Maximum concurrent threads
-        for i in range(num_chunks):
-            thread = threading.Thread(target=download_chunk, args=(i,))
-            threads.append(thread)
-            thread.start()
-            
-            # Limit concurrent threads
-            if len(threads) >= max_threads:
-                threads[0].join()
-                threads.pop(0)
-        
-        # Wait for remaining threads
-        for thread in threads:
-            thread.join()
+            body_queue.put((start_byte, response['Body']))
+        
+        def write_chunks():
+            while True:
+                item = body_queue.get()
+                if item is None:
+                    return
+                start_byte, stream = item
+                
+                # Keep draining after a failure so the request workers never block on a full queue
+                try:
+                    # Stream the body straight into its slice of the mapped file
+                    offset = start_byte
+                    while True:
+                        block = stream.read(1024 * 1024)
+                        if not block:
+                            break
+                        mapped_file[offset:offset + len(block)] = block
+                        offset += len(block)
+                    record_progress(offset - start_byte)
+                except Exception as e:
+                    write_errors.append(e)
+                finally:
+                    stream.close()
+        
+        # Create the file with its blocks reserved up front, so concurrent
+        # writers never wait on the filesystem allocator filling in holes
+        fd = os.open(download_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, file_size)
+            else:
+                # posix_fallocate is not available on macOS
+                os.ftruncate(fd, file_size)
+        except OSError:
+            os.close(fd)
+            raise
+        
+        # Map the file once and let every worker write into it in place
+        mapped_file = mmap.mmap(fd, file_size, access=mmap.ACCESS_WRITE)
+        try:
+            if AIOBOTO3_AVAILABLE:
+                # Multiplex all range requests on a single event loop thread
+                asyncio.run(download_chunks_async(
+                    mapped_file,
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    file_size,
+                    chunk_size,
+                    num_chunks,
+                    record_progress
+                ))
+            else:
+                # Reuse the shared optimized client
+                s3_client = get_s3_client()
+                
+                # Pipeline the download: request workers keep issuing range GETs
+                # while write workers drain the bodies that are already streaming
+                with concurrent.futures.ThreadPoolExecutor(max_workers=RANGE_WRITE_WORKERS) as io_pool:
+                    writers = [io_pool.submit(write_chunks) for _ in range(RANGE_WRITE_WORKERS)]
+                    try:
+                        with concurrent.futures.ThreadPoolExecutor(max_workers=RANGE_REQUEST_WORKERS) as request_pool:
+                            requests = [request_pool.submit(request_chunk, i) for i in range(num_chunks)]
+                            for future in concurrent.futures.as_completed(requests):
+                                future.result()
+                    finally:
+                        # One sentinel per writer, sent even if a request failed
+                        for _ in writers:
+                            body_queue.put(None)
+                    for future in writers:
+                        future.result()
+                if write_errors:
+                    raise write_errors[0]
+            mapped_file.flush()
+        finally:
+            mapped_file.close()
+            os.close(fd)
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -339,14 +516,82 @@ def optimized_range_download():
         logger.error(f"Error during optimized range S3 download: {e}")
         raise
 
-def object_exists_in_s3(bucket, key):
-    """Check if an object exists in S3"""
+async def download_chunks_async(mapped_file, key, file_size, chunk_size, num_chunks, on_chunk):
+    """Download byte ranges of an object into a mapped file using aioboto3"""
+    semaphore = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+    session = aioboto3.Session()
+    
+    use_ssl = not ALLOW_PLAINTEXT_S3
+    async with session.client(
+        's3',
+        use_ssl=use_ssl,
+        endpoint_url=f"{'https' if use_ssl else 'http'}://{S3_ENDPOINT_HOST}",
+        config=get_optimized_client_config()
+    ) as s3_client:
+        async def download_chunk(chunk_index):
+            start_byte = chunk_index * chunk_size
+            end_byte = min(start_byte + chunk_size - 1, file_size - 1)
+            
+            async with semaphore:
+                response = await s3_client.get_object(
+                    Bucket=bucket_name(),
+                    Key=key,
+                    Range=f"bytes={start_byte}-{end_byte}"
+                )
+                
+                # Stream the body straight into its slice of the mapped file
+                offset = start_byte
+                async for block in response['Body'].iter_chunks(1024 * 1024):
+                    mapped_file[offset:offset + len(block)] = block
+                    offset += len(block)
+            
+            on_chunk(offset - start_byte)
+        
+        await asyncio.gather(*[download_chunk(i) for i in range(num_chunks)])
+
+def head_or_upload(key):
+    """Return the size of an object in S3, uploading the test file first if it is missing"""
+    s3_client = get_s3_client(optimized=False)
     try:
-        s3_client = boto3.client('s3', region_name=REGION)
-        s3_client.head_object(Bucket=bucket, Key=key)
-        return True
+        return s3_client.head_object(Bucket=bucket_name(), Key=key)['ContentLength']
     except ClientError as e:
-        return False
+        if e.response['Error']['Code'] not in ('404', 'NoSuchKey', 'NotFound'):
+            raise
+    
+    logger.info(f"File {TEST_FILE} not found in S3, uploading first")
+    s3_client.upload_file(TEST_FILE, bucket_name(), key)
+    return s3_client.head_object(Bucket=bucket_name(), Key=key)['ContentLength']
+
+def purge_bucket(bucket):
+    """Delete every object and unfinished multipart upload in a bucket"""
+    s3_client = get_s3_client(optimized=False)
+    
+    # Send one DeleteObjects call per page of 1000 keys, several pages at a time
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = []
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket):
+            keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if keys:
+                futures.append(executor.submit(
+                    s3_client.delete_objects,
+                    Bucket=bucket,
+                    Delete={'Objects': keys, 'Quiet': True}
+                ))
+        
+        # Abort unfinished multipart uploads, their parts are still billed
+        paginator = s3_client.get_paginator('list_multipart_uploads')
+        for page in paginator.paginate(Bucket=bucket):
+            for upload in page.get('Uploads', []):
+                futures.append(executor.submit(
+                    s3_client.abort_multipart_upload,
+                    Bucket=bucket,
+                    Key=upload['Key'],
+                    UploadId=upload['UploadId']
+                ))
+        
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
 
 def clean_up(bucket):
     """Clean up all created resources"""
@@ -354,13 +599,11 @@ def clean_up(bucket):
     
     # Delete objects in S3 bucket
     try:
-        s3 = boto3.resource('s3')
-        bucket_obj = s3.Bucket(bucket)
-        bucket_obj.objects.all().delete()
+        purge_bucket(bucket)
         logger.info(f"Deleted all objects in bucket: {bucket}")
         
         # Delete the bucket
-        bucket_obj.delete()
+        get_s3_client(optimized=False).delete_bucket(Bucket=bucket)
         logger.info(f"Deleted bucket: {bucket}")
     except ClientError as e:
         logger.error(f"Error cleaning up S3 resources: {e}")
@@ -391,17 +634,17 @@ def run_tests():
         for i in range(TEST_ITERATIONS):
             logger.info(f"\n--- Test Iteration {i+1}/{TEST_ITERATIONS} ---\n")
             
-            # Run optimized upload test
+            # Run optimized upload test first so the object exists for both downloads
             logger.info("\n=== Optimized S3 Upload Test ===")
-            results['optimized_upload'].append(optimized_upload())
-            
-            # Run optimized download test
-            logger.info("\n=== Optimized S3 Download Test ===")
-            results['optimized_download'].append(optimized_download())
+            results['optimized_upload'].append(optimized_upload(file_size))
             
-            # Run optimized range download test
-            logger.info("\n=== Optimized S3 Range Download Test ===")
-            results['optimized_range_download'].append(optimized_range_download())
+            # Run both download tests side by side, they write to different local paths
+            logger.info("\n=== Optimized S3 Download and Range Download Tests ===")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                download_future = executor.submit(optimized_download, file_size)
+                range_download_future = executor.submit(optimized_range_download, file_size)
+                results['optimized_download'].append(download_future.result())
+                results['optimized_range_download'].append(range_download_future.result())
         
         # Generate summary report
         generate_report(results, file_size)
@@ -419,10 +662,29 @@ def generate_report(results, file_size):
     
     # Helper function to calculate averages
     def calculate_averages(test_results):
-        durations = [result['duration'] for result in test_results if result is not None]
-        throughputs = [result['throughput'] for result in test_results if result is not None]
-        
-        if not durations:
+        count = 0
+        total_duration = 0.0
+        total_throughput = 0.0
+        min_duration = 0
+        max_throughput = 0
+        
+        # Fold the sums and extremes into a single pass over the results
+        for result in test_results:
+            if result is None:
+                continue
+            duration = result['duration']
+            throughput = result['throughput']
+            if count == 0:
+                min_duration = duration
+                max_throughput = throughput
+            else:
+                min_duration = min(min_duration, duration)
+                max_throughput = max(max_throughput, throughput)
+            total_duration += duration
+            total_throughput += throughput
+            count += 1
+        
+        if not count:
             return {
                 'avg_duration': 0,
                 'avg_throughput': 0,
@@ -431,10 +693,10 @@ def generate_report(results, file_size):
             }
         
         return {
-            'avg_duration': statistics.mean(durations),
-            'avg_throughput': statistics.mean(throughputs),
-            'min_duration': min(durations),
-            'max_throughput': max(throughputs)
+            'avg_duration': total_duration / count,
+            'avg_throughput': total_throughput / count,
+            'min_duration': min_duration,
+            'max_throughput': max_throughput
         }
     
     # Calculate averages for each test type
@@ -451,6 +713,10 @@ def generate_report(results, file_size):
         avg = averages[test_name]
         logger.info(f"{test_name:<30} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f} {avg['max_throughput']:<20.2f}")
     
+    # The two downloads overlap in run_tests, so each one only had part of the link
+    logger.info("\nNote: optimized_download and optimized_range_download were measured concurrently, "
+                "their throughputs share the link and are not standalone figures")
+    
 
     
     # Calculate improvement percentages
@@ -467,14 +733,14 @@ def generate_report(results, file_size):
     if optimized_download_speed > 0:
         vs_direct = ((optimized_download_speed - 7.58) / 7.58) * 100
         vs_crt = ((optimized_download_speed - 30.90) / 30.90) * 100
-        logger.info(f"\nOptimized download speed: {optimized_download_speed:.2f} MB/s")
+        logger.info(f"\nOptimized download speed (measured concurrently): {optimized_download_speed:.2f} MB/s")
 
     
     if optimized_range_download_speed > 0:
         vs_direct = ((optimized_range_download_speed - 7.58) / 7.58) * 100
         vs_crt = ((optimized_range_download_speed - 30.90) / 30.90) * 100
         vs_optimized = ((optimized_range_download_speed - optimized_download_speed) / optimized_download_speed) * 100
-        logger.info(f"\nOptimized range download speed: {optimized_range_download_speed:.2f} MB/s")
+        logger.info(f"\nOptimized range download speed (measured concurrently): {optimized_range_download_speed:.2f} MB/s")
 
     
     logger.info("\n=== COST ANALYSIS ===\n")
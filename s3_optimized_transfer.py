@@ -14,20 +14,41 @@ It tests both upload and download performance with these optimizations.
 
 import os
 import time
+import asyncio
+import json
 import uuid
+import random
 import boto3
+import atexit
 import logging
+import logging.handlers
+import queue
 import threading
-import statistics
+import functools
+import collections
+import concurrent.futures
+import botocore.session
 from datetime import datetime
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from botocore.config import Config
+from botocore.utils import InstanceMetadataRegionFetcher
+from botocore.retries import quota, standard
+from boto3.s3.transfer import TransferConfig
+from s3transfer.subscribers import BaseSubscriber
 
-# Configure logging
+# Configure logging, callers only enqueue records and a listener thread does the terminal IO
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+# QueueHandler.prepare() bakes the formatted line into the record, so the listener only prints it
+log_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records before the interpreter exits
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -37,21 +58,89 @@ S3_BUCKET = f"s3-optimized-test-{UNIQUE_ID}"
 TEST_FILE = "test.zip"
 LOCAL_PATH = os.path.abspath(TEST_FILE)
 S3_PREFIX = "optimized-test"
+# Throughput in MB/s measured by the other scripts, used for the report comparisons
+BASELINE_THROUGHPUT = {
+    'upload': {'crt': 6.38, 'direct': 7.00, 'datasync': 15.00},
+    'download': {'crt': 30.90, 'direct': 7.58, 'datasync': 18.00}
+}
+CRT_PART_SIZE = 25 * 1024 * 1024  # 25 MB parts for the native CRT client
+CRT_THROUGHPUT_TARGET_GBPS = 10.0
+MULTIPART_CHUNKSIZE = 64 * 1024 * 1024  # 64 MB chunks
+IO_CHUNKSIZE = 1 * 1024 * 1024  # 1 MB reads keep the download writer thread from falling behind
+MIN_MULTIPART_THRESHOLD = 25 * 1024 * 1024  # Below this one PutObject beats initiate + parts + complete
+MAX_MULTIPART_THRESHOLD = 100 * 1024 * 1024
+MAX_CONCURRENCY_CAP = 16  # S3 throttles large fan-outs per prefix, more parts in flight make it slower
+MAX_IN_MEMORY_UPLOAD_PARTS = 10  # Same bound as s3transfer's max_in_memory_upload_chunks
+MAX_RETRY_ATTEMPTS = 4  # A stuck part should fail fast rather than skew the measured duration
+RETRY_BASE_DELAY = 0.05  # Seconds
+RETRY_MAX_DELAY = 20.0  # Seconds
+ACCELERATE_POLL_DELAYS = (0.25, 0.5, 1, 2, 4, 8)  # Seconds between accelerate endpoint probes
+HEDGE_BASE_LATENCY = 0.015  # Seconds to first byte for a healthy GET
+HEDGE_LINK_THROUGHPUT = 150e6  # Bytes per second shared by all in-flight part GETs
+HEDGE_DELAY_FACTOR = 2  # Re-issue a part once it takes twice its expected time
+HEDGE_MAX_IN_FLIGHT = 4  # Duplicate GETs allowed at once
+HEDGE_POLL_INTERVAL = 0.25  # Seconds between straggler checks
+ASYNC_MAX_IN_FLIGHT = 40  # Concurrent part requests on the aioboto3 event loop
+# Set USE_ASYNC=1 to run transfers on one asyncio event loop with aioboto3 instead of the CRT or threads
+USE_ASYNC = os.environ.get('USE_ASYNC') == '1'
 
-# Check if boto3 has CRT support
+# Check if the AWS CRT is installed
 try:
-    from boto3.s3.transfer import TransferConfig
+    import awscrt.auth
+    import awscrt.io
+    import awscrt.s3
+    from s3transfer.crt import BotocoreCRTRequestSerializer, CRTTransferManager
     CRT_AVAILABLE = True
     logger.info("AWS CRT support is available")
 except ImportError:
     CRT_AVAILABLE = False
     logger.warning("AWS CRT support is not available. Install with: pip install 'boto3[crt]'")
 
+# Check if aioboto3 is installed
+try:
+    import aioboto3
+    AIOBOTO3_AVAILABLE = True
+except ImportError:
+    AIOBOTO3_AVAILABLE = False
+    if USE_ASYNC:
+        logger.warning("aioboto3 is not available, USE_ASYNC is ignored. Install with: pip install aioboto3")
+
+@functools.lru_cache(maxsize=None)
+def get_standard_client():
+    """Return the shared S3 client used for bucket management"""
+    return boto3.client('s3', region_name=REGION)
+
+def accelerate_endpoint_ready():
+    """Check whether a signed request through the accelerate endpoint is accepted for the bucket"""
+    # The accelerate hostname is wildcard DNS, only a signed request shows whether the setting has propagated
+    try:
+        create_optimized_client(use_acceleration=True).head_bucket(Bucket=S3_BUCKET)
+        return True
+    except ClientError as e:
+        # 400 / InvalidRequest means acceleration is not active for the bucket yet
+        logger.info(f"Accelerate endpoint not ready yet: {e.response['Error'].get('Code')}")
+        return False
+    except BotoCoreError:
+        return False
+
+def wait_for_acceleration(s3_client):
+    """Poll until Transfer Acceleration is enabled and its endpoint answers"""
+    status = s3_client.get_bucket_accelerate_configuration(Bucket=S3_BUCKET).get('Status')
+    if status != 'Enabled':
+        logger.warning(f"Transfer Acceleration status is {status}, accelerated tests may fail")
+        return
+    
+    for delay in ACCELERATE_POLL_DELAYS:
+        if accelerate_endpoint_ready():
+            return
+        time.sleep(delay)
+    logger.warning("Accelerate endpoint did not answer yet, continuing anyway")
+
 def create_bucket_with_acceleration():
     """Create S3 bucket and enable Transfer Acceleration"""
     try:
         logger.info(f"Creating S3 bucket: {S3_BUCKET}")
-        s3_client = boto3.client('s3', region_name=REGION)
+        s3_client = get_standard_client()
         
         # Create the bucket
         if REGION == 'us-east-1':
@@ -71,22 +160,33 @@ def create_bucket_with_acceleration():
         
         # Wait for acceleration to be enabled
         logger.info("Waiting for Transfer Acceleration to be enabled...")
-        time.sleep(10)  # Give some time for the configuration to propagate
+        wait_for_acceleration(s3_client)
         
         return S3_BUCKET
     except ClientError as e:
         logger.error(f"Error creating bucket or enabling acceleration: {e}")
         raise
 
-def create_optimized_client(use_acceleration=True):
-    """Create an optimized S3 client with CRT and acceleration enabled"""
-    # Create a boto3 client with optimized settings
-    s3_config = Config(
+@functools.lru_cache(maxsize=None)
+def is_same_region():
+    """Check whether this host runs in the same region as the test bucket"""
+    # Ask EC2 instance metadata for the region, off EC2 this times out quickly and returns None
+    host_region = InstanceMetadataRegionFetcher(timeout=1, num_attempts=1).retrieve_region()
+    if host_region == REGION:
+        logger.info(f"Acceleration bypassed: same-region ({REGION})")
+        return True
+    return False
+
+def get_optimized_client_config(use_acceleration=True):
+    """Get the botocore configuration with optimized settings"""
+    # Acceleration only adds an edge hop when the client already sits next to the bucket
+    use_acceleration = use_acceleration and not is_same_region()
+    return Config(
         region_name=REGION,
         signature_version='s3v4',
         retries={
-            'max_attempts': 10,
-            'mode': 'adaptive'  # Use adaptive retry mode
+            'max_attempts': MAX_RETRY_ATTEMPTS,
+            'mode': 'standard'  # Backoff is replaced with decorrelated jitter in create_optimized_client
         },
         s3={
             'use_accelerate_endpoint': use_acceleration,  # Enable/disable Transfer Acceleration
@@ -96,28 +196,189 @@ def create_optimized_client(use_acceleration=True):
             'us_east_1_regional_endpoint': 'regional'
         }
     )
+
+class RequestLimit(object):
+    """Ceiling on in-flight part requests that drops by one whenever S3 throttles"""
+    def __init__(self, limit):
+        self._limit = limit
+        self._active = 0
+        self._condition = threading.Condition()
+        
+    def reset(self, limit):
+        with self._condition:
+            self._limit = limit
+            self._condition.notify_all()
+        
+    def on_attempt(self, response=None, **kwargs):
+        # Runs on every attempt, ahead of the retry handler's own backoff
+        if response is None:
+            return
+        http_response, parsed = response
+        if http_response.status_code == 503 or parsed.get('Error', {}).get('Code') == 'SlowDown':
+            with self._condition:
+                if self._limit > 1:
+                    self._limit -= 1
+                    logger.warning(f"S3 is throttling, lowering part concurrency to {self._limit}")
+        
+    def __enter__(self):
+        with self._condition:
+            while self._active >= self._limit:
+                self._condition.wait()
+            self._active += 1
+        return self
+        
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+# Shared by the threaded part workers, the tests run one transfer at a time
+request_limit = RequestLimit(MAX_CONCURRENCY_CAP)
+
+class DecorrelatedJitterBackoff(object):
+    """Retry delay that grows from the previous sleep of the same request with full jitter"""
+    def delay_amount(self, context):
+        # Keep the last sleep on the request context so concurrent requests back off independently
+        last_delay = context.request_context.get('last_retry_delay', RETRY_BASE_DELAY)
+        delay = min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, last_delay * 3))
+        context.request_context['last_retry_delay'] = delay
+        return delay
+
+def use_decorrelated_jitter(s3_client):
+    """Replace the standard retry handler's exponential backoff with decorrelated jitter"""
+    events = s3_client.meta.events
+    retry_quota = standard.RetryQuotaChecker(quota.RetryQuota())
+    handler = standard.RetryHandler(
+        retry_policy=standard.RetryPolicy(
+            retry_checker=standard.StandardRetryConditions(
+                max_attempts=s3_client.meta.config.retries.get('total_max_attempts', MAX_RETRY_ATTEMPTS + 1)
+            ),
+            retry_backoff=DecorrelatedJitterBackoff()
+        ),
+        retry_event_adapter=standard.RetryEventAdapter(),
+        retry_quota=retry_quota
+    )
     
-    # Create the client
-    return boto3.client('s3', config=s3_config)
-
-def get_optimized_transfer_config(for_upload=True):
-    """Get optimized transfer configuration based on operation type"""
-    if for_upload:
-        # For uploads, use slightly lower concurrency but larger chunk size
-        return TransferConfig(
-            multipart_threshold=25 * 1024 * 1024,  # 25 MB
-            max_concurrency=15,                    # 15 concurrent threads
-            multipart_chunksize=25 * 1024 * 1024,  # 25 MB chunks
-            use_threads=True
-        )
-    else:
-        # For downloads, use higher concurrency
-        return TransferConfig(
-            multipart_threshold=25 * 1024 * 1024,  # 25 MB
-            max_concurrency=20,                    # 20 concurrent threads
-            multipart_chunksize=25 * 1024 * 1024,  # 25 MB chunks
-            use_threads=True
-        )
+    # Same event and unique id that botocore uses when it installs standard retries
+    events.unregister('needs-retry.s3', unique_id='retry-config-s3')
+    events.register('needs-retry.s3', handler.needs_retry, unique_id='retry-config-s3')
+    events.register('after-call.s3', retry_quota.release_retry_quota)
+
+@functools.lru_cache(maxsize=2)
+def create_optimized_client(use_acceleration=True):
+    """Create an optimized S3 client with acceleration enabled"""
+    # Create a boto3 client with optimized settings
+    s3_client = boto3.client('s3', config=get_optimized_client_config(use_acceleration))
+    use_decorrelated_jitter(s3_client)
+    
+    # Shrink the part concurrency as soon as a part request is throttled
+    s3_client.meta.events.register('needs-retry.s3.UploadPart', request_limit.on_attempt)
+    s3_client.meta.events.register('needs-retry.s3.GetObject', request_limit.on_attempt)
+    return s3_client
+
+@functools.lru_cache(maxsize=None)
+def get_crt_s3_client():
+    """Return the shared native CRT S3 client, built with its event loop and resolver on first use"""
+    # Multipart slicing, signing and the HTTP connections all run in native CRT threads
+    event_loop_group = awscrt.io.EventLoopGroup(os.cpu_count())
+    host_resolver = awscrt.io.DefaultHostResolver(event_loop_group)
+    bootstrap = awscrt.io.ClientBootstrap(event_loop_group, host_resolver)
+    credential_provider = awscrt.auth.AwsCredentialsProvider.new_default_chain(bootstrap)
+    
+    return awscrt.s3.S3Client(
+        bootstrap=bootstrap,
+        region=REGION,
+        credential_provider=credential_provider,
+        part_size=CRT_PART_SIZE,
+        throughput_target_gbps=CRT_THROUGHPUT_TARGET_GBPS
+    )
+
+@functools.lru_cache(maxsize=2)
+def get_crt_request_serializer(use_acceleration=True):
+    """Return a cached request serializer for the CRT transfer manager"""
+    # botocore serializes the requests, so the accelerate endpoint setting still applies
+    return BotocoreCRTRequestSerializer(
+        botocore.session.Session(),
+        {'region_name': REGION, 'config': get_optimized_client_config(use_acceleration)}
+    )
+
+def create_crt_transfer_manager(use_acceleration=True):
+    """Create a transfer manager backed by the native AWS CRT S3 client"""
+    # The manager itself is cheap, the CRT client and its connections are shared between runs
+    return CRTTransferManager(get_crt_s3_client(), get_crt_request_serializer(use_acceleration))
+
+class ProgressSubscriber(BaseSubscriber):
+    """Forward CRT transfer progress to a plain progress callback"""
+    def __init__(self, callback):
+        self._callback = callback
+        
+    def on_progress(self, bytes_transferred, **kwargs):
+        self._callback(bytes_transferred)
+
+@functools.lru_cache(maxsize=None)
+def get_optimized_transfer_config(file_size):
+    """Get optimized transfer configuration sized for the file being moved"""
+    # 64 MB parts cut the per-part signing and round-trip overhead of smaller chunks
+    num_parts = max(1, -(-file_size // MULTIPART_CHUNKSIZE))  # Ceiling division
+    
+    # Run about 1.5 parts per thread, bounded by what the CPUs can drive
+    max_concurrency = min((os.cpu_count() or 1) * 4, max(8, int(num_parts * 1.5)))
+    
+    # Never open more connections than there are parts, or than S3 takes without throttling
+    max_concurrency = min(max_concurrency, num_parts, MAX_CONCURRENCY_CAP)
+    logger.info(f"Using {max_concurrency} concurrent requests for {num_parts} parts of {MULTIPART_CHUNKSIZE / (1024**2):.0f} MB")
+    
+    # Mid-sized files are cheaper as one request than as a handful of parts
+    multipart_threshold = max(MIN_MULTIPART_THRESHOLD, min(MAX_MULTIPART_THRESHOLD, file_size // 32))
+    
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        max_concurrency=max_concurrency,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        io_chunksize=IO_CHUNKSIZE,
+        use_threads=True
+    )
+
+class ProgressPercentage(object):
+    """Track transfer progress without a lock and print it from a sampler thread"""
+    def __init__(self, total_size, label, start_time):
+        self._total_size = total_size
+        self._label = label
+        self._start_time = start_time
+        # deque.append is atomic, so transfer threads never wait on each other here
+        self._pending = collections.deque()
+        self._seen_so_far = 0
+        self._update_interval = 1.0  # Update every second
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        
+    def __call__(self, bytes_amount):
+        self._pending.append(bytes_amount)
+        
+    def __enter__(self):
+        self._sampler.start()
+        return self
+        
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._sampler.join()
+        
+    def _drain(self):
+        # Only the sampler thread touches the running total
+        pending = self._pending
+        while pending:
+            self._seen_so_far += pending.popleft()
+        
+    def _sample(self):
+        while not self._stopped.wait(self._update_interval):
+            self._drain()
+            seen = self._seen_so_far
+            percentage = (seen / self._total_size) * 100
+            elapsed = time.time() - self._start_time
+            speed = seen / (1024 * 1024 * elapsed) if elapsed > 0 else 0
+            
+            print(f"\r[{self._label}] Progress: {seen}/{self._total_size} bytes "
+                  f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
 
 def optimized_upload(use_acceleration=True):
     """Perform an upload using optimized settings"""
@@ -125,49 +386,68 @@ def optimized_upload(use_acceleration=True):
     start_time = time.time()
     
     try:
-        acceleration_status = "with" if use_acceleration else "without"
+        # Record what the client actually does, same-region runs never touch the accelerate endpoint
+        accelerated = use_acceleration and not is_same_region()
+        acceleration_status = "with" if accelerated else "without"
         logger.info(f"Starting optimized S3 upload {acceleration_status} acceleration of {TEST_FILE} ({file_size / (1024**2):.2f} MB)")
         
-        # Create a callback class to track upload progress
-        class ProgressPercentage(object):
-            def __init__(self, filename):
-                self._filename = filename
-                self._size = float(os.path.getsize(filename))
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
+        # Track progress on a sampler thread while the transfer runs
+        progress = ProgressPercentage(file_size, f"OPTIMIZED UPLOAD {acceleration_status.upper()} ACCELERATION", start_time)
+        with progress:
+            if file_size < get_optimized_transfer_config(file_size).multipart_threshold:
+                # One PutObject skips the CreateMultipartUpload and CompleteMultipartUpload round trips
+                with open(TEST_FILE, 'rb') as f:
+                    create_optimized_client(use_acceleration=use_acceleration).put_object(
+                        Bucket=S3_BUCKET,
+                        Key=f"{S3_PREFIX}/{TEST_FILE}",
+                        Body=f
+                    )
+                progress(file_size)
+            elif USE_ASYNC and AIOBOTO3_AVAILABLE:
+                # Send every part from one thread over a shared aiohttp connection pool
+                asyncio.run(async_multipart_upload(
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    file_size,
+                    MULTIPART_CHUNKSIZE,
+                    use_acceleration=use_acceleration,
+                    callback=progress
+                ))
+            elif CRT_AVAILABLE:
+                # Part size and throughput target replace the TransferConfig chunk size and concurrency
+                with create_crt_transfer_manager(use_acceleration=use_acceleration) as transfer_manager:
+                    future = transfer_manager.upload(
+                        TEST_FILE,
+                        S3_BUCKET,
+                        f"{S3_PREFIX}/{TEST_FILE}",
+                        subscribers=[ProgressSubscriber(progress)]
+                    )
+                    future.result()
+            else:
+                # Get optimized transfer config
+                transfer_config = get_optimized_transfer_config(file_size)
                 
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[OPTIMIZED UPLOAD {acceleration_status.upper()} ACCELERATION] Progress: {self._seen_so_far}/{self._size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
-        
-        # Get optimized transfer config
-        transfer_config = get_optimized_transfer_config(for_upload=True)
-        
-        # Create optimized client
-        s3_client = create_optimized_client(use_acceleration=use_acceleration)
-        
-        # Use the client to upload the file
-        s3_client.upload_file(
-            TEST_FILE, 
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}",
-            Config=transfer_config,
-            Callback=ProgressPercentage(TEST_FILE)
-        )
+                # Create optimized client
+                s3_client = create_optimized_client(use_acceleration=use_acceleration)
+                
+                if hasattr(os, 'preadv') and file_size >= transfer_config.multipart_threshold:
+                    # Read every part straight into its request buffer from one descriptor
+                    pread_multipart_upload(
+                        s3_client,
+                        f"{S3_PREFIX}/{TEST_FILE}",
+                        file_size,
+                        transfer_config.multipart_chunksize,
+                        transfer_config.max_concurrency,
+                        callback=progress
+                    )
+                else:
+                    # Use the client to upload the file
+                    s3_client.upload_file(
+                        TEST_FILE, 
+                        S3_BUCKET, 
+                        f"{S3_PREFIX}/{TEST_FILE}",
+                        Config=transfer_config,
+                        Callback=progress
+                    )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -180,7 +460,7 @@ def optimized_upload(use_acceleration=True):
         return {
             'duration': duration,
             'throughput': throughput,
-            'acceleration': use_acceleration
+            'acceleration': accelerated
         }
     except ClientError as e:
         logger.error(f"Error during optimized S3 upload: {e}")
@@ -189,7 +469,7 @@ def optimized_upload(use_acceleration=True):
 def optimized_download(use_acceleration=True):
     """Perform a download using optimized settings"""
     # First ensure the file exists in S3
-    standard_s3 = boto3.client('s3', region_name=REGION)
+    standard_s3 = get_standard_client()
     if not object_exists_in_s3(S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}"):
         logger.info(f"File {TEST_FILE} not found in S3, uploading first")
         standard_s3.upload_file(TEST_FILE, S3_BUCKET, f"{S3_PREFIX}/{TEST_FILE}")
@@ -203,48 +483,51 @@ def optimized_download(use_acceleration=True):
     start_time = time.time()
     
     try:
-        acceleration_status = "with" if use_acceleration else "without"
+        # Record what the client actually does, same-region runs never touch the accelerate endpoint
+        accelerated = use_acceleration and not is_same_region()
+        acceleration_status = "with" if accelerated else "without"
         logger.info(f"Starting optimized S3 download {acceleration_status} acceleration to {download_path} ({file_size / (1024**2):.2f} MB)")
         
-        # Create a callback class to track download progress
-        class ProgressPercentage(object):
-            def __init__(self, total_size):
-                self._total_size = total_size
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
+        # Track progress on a sampler thread while the transfer runs
+        progress = ProgressPercentage(file_size, f"OPTIMIZED DOWNLOAD {acceleration_status.upper()} ACCELERATION", start_time)
+        with progress:
+            if USE_ASYNC and AIOBOTO3_AVAILABLE:
+                # Fetch every part from one thread over a shared aiohttp connection pool
+                asyncio.run(async_range_download(
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    download_path,
+                    file_size,
+                    MULTIPART_CHUNKSIZE,
+                    use_acceleration=use_acceleration,
+                    callback=progress
+                ))
+            elif CRT_AVAILABLE:
+                # Let the native CRT client fetch the parts
+                with create_crt_transfer_manager(use_acceleration=use_acceleration) as transfer_manager:
+                    future = transfer_manager.download(
+                        S3_BUCKET,
+                        f"{S3_PREFIX}/{TEST_FILE}",
+                        download_path,
+                        subscribers=[ProgressSubscriber(progress)]
+                    )
+                    future.result()
+            else:
+                # Get optimized transfer config
+                transfer_config = get_optimized_transfer_config(file_size)
                 
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._total_size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[OPTIMIZED DOWNLOAD {acceleration_status.upper()} ACCELERATION] Progress: {self._seen_so_far}/{self._total_size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
-        
-        # Get optimized transfer config
-        transfer_config = get_optimized_transfer_config(for_upload=False)
-        
-        # Create optimized client
-        s3_client = create_optimized_client(use_acceleration=use_acceleration)
-        
-        # Use the client to download the file
-        s3_client.download_file(
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}", 
-            download_path,
-            Config=transfer_config,
-            Callback=ProgressPercentage(file_size)
-        )
+                # Create optimized client
+                s3_client = create_optimized_client(use_acceleration=use_acceleration)
+                
+                # Download the parts ourselves so stragglers can be hedged
+                hedged_download(
+                    s3_client,
+                    f"{S3_PREFIX}/{TEST_FILE}",
+                    download_path,
+                    file_size,
+                    transfer_config.multipart_chunksize,
+                    transfer_config.max_concurrency,
+                    callback=progress
+                )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -260,16 +543,248 @@ def optimized_download(use_acceleration=True):
         return {
             'duration': duration,
             'throughput': throughput,
-            'acceleration': use_acceleration
+            'acceleration': accelerated
         }
     except ClientError as e:
         logger.error(f"Error during optimized S3 download: {e}")
         raise
 
+def open_preallocated(path, size):
+    """Open a file for writing with all of its blocks reserved up front"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # Reserved blocks let parallel pwrite calls land without waiting on the allocator
+        if size > 0 and hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            # posix_fallocate is not available on macOS
+            os.ftruncate(fd, size)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+def pread_multipart_upload(s3_client, key, file_size, part_size, max_concurrency, callback=None):
+    """Upload a file as a multipart upload, reading each part with preadv from one shared descriptor"""
+    ranges = [(start, min(part_size, file_size - start)) for start in range(0, file_size, part_size)]
+    upload_id = s3_client.create_multipart_upload(Bucket=S3_BUCKET, Key=key)['UploadId']
+    fd = os.open(TEST_FILE, os.O_RDONLY)
+    
+    def upload_part(index):
+        offset, size = ranges[index]
+        
+        # preadv fills the part buffer in place, positional reads never race on the file offset
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < size:
+            filled += os.preadv(fd, [view[filled:]], offset + filled)
+        
+        with request_limit:
+            response = s3_client.upload_part(
+                Bucket=S3_BUCKET,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=index + 1,
+                Body=buffer
+            )
+        if callback:
+            callback(size)
+        return {'PartNumber': index + 1, 'ETag': response['ETag']}
+    
+    try:
+        # Each worker holds one whole part in memory, so bound them like s3transfer does
+        workers = min(max_concurrency, MAX_IN_MEMORY_UPLOAD_PARTS)
+        request_limit.reset(workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(upload_part, range(len(ranges))))
+        s3_client.complete_multipart_upload(
+            Bucket=S3_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+    except Exception:
+        # Do not leave billed parts behind
+        s3_client.abort_multipart_upload(Bucket=S3_BUCKET, Key=key, UploadId=upload_id)
+        raise
+    finally:
+        os.close(fd)
+
+def hedged_download(s3_client, key, download_path, file_size, part_size, max_concurrency, callback=None):
+    """Download an object with ranged GETs, re-issuing any part that falls far behind"""
+    # A part shares the link with max_concurrency others, so this is its expected duration
+    hedge_after = HEDGE_DELAY_FACTOR * (HEDGE_BASE_LATENCY + part_size * max_concurrency / HEDGE_LINK_THROUGHPUT)
+    ranges = [(start, min(start + part_size, file_size) - 1) for start in range(0, file_size, part_size)]
+    started = {}
+    finished = set()
+    aborted = threading.Event()
+    
+    def fetch(index):
+        start_byte, end_byte = ranges[index]
+        with request_limit:
+            if aborted.is_set():
+                return
+            started.setdefault(index, time.time())
+            response = s3_client.get_object(
+                Bucket=S3_BUCKET,
+                Key=key,
+                Range=f"bytes={start_byte}-{end_byte}"
+            )
+            
+            # Both copies of a hedged part write the same bytes, whichever copy
+            # loses stops reading as soon as the other has finished
+            stream = response['Body']
+            try:
+                offset = start_byte
+                while index not in finished and not aborted.is_set():
+                    block = stream.read(IO_CHUNKSIZE)
+                    if not block:
+                        break
+                    os.pwrite(fd, block, offset)
+                    offset += len(block)
+            finally:
+                stream.close()
+    
+    fd = open_preallocated(download_path, file_size)
+    # Leave room for the hedges on top of the regular part requests
+    request_limit.reset(max_concurrency + HEDGE_MAX_IN_FLIGHT)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as pool, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=HEDGE_MAX_IN_FLIGHT) as hedge_pool:
+            pending = {pool.submit(fetch, index): index for index in range(len(ranges))}
+            hedged = set()
+            
+            try:
+                while pending:
+                    done, _ = concurrent.futures.wait(
+                        pending,
+                        timeout=HEDGE_POLL_INTERVAL,
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        index = pending.pop(future)
+                        if index in finished:
+                            continue
+                        try:
+                            future.result()
+                        except Exception:
+                            # Let the other copy of a hedged part decide the outcome
+                            if index in pending.values():
+                                continue
+                            raise
+                        finished.add(index)
+                        if callback:
+                            callback(ranges[index][1] - ranges[index][0] + 1)
+                
+                    # Duplicate any part that has been running for too long
+                    now = time.time()
+                    for index in set(pending.values()):
+                        if index not in hedged and now - started.get(index, now) > hedge_after:
+                            hedged.add(index)
+                            pending[hedge_pool.submit(fetch, index)] = index
+            except BaseException:
+                # Fail fast, do not let the executors drain every remaining part on shutdown
+                aborted.set()
+                for future in pending:
+                    future.cancel()
+                raise
+    finally:
+        os.close(fd)
+
+def create_async_client(use_acceleration=True):
+    """Create an aioboto3 S3 client whose aiohttp pool can hold every in-flight part"""
+    config = get_optimized_client_config(use_acceleration).merge(
+        Config(max_pool_connections=ASYNC_MAX_IN_FLIGHT, tcp_keepalive=True)
+    )
+    return aioboto3.Session().client('s3', config=config)
+
+def read_part(fd, offset, size):
+    """Read exactly size bytes at offset, pread may return fewer than requested"""
+    data = bytearray()
+    while len(data) < size:
+        block = os.pread(fd, size - len(data), offset + len(data))
+        if not block:
+            raise IOError(f"{TEST_FILE} ended at byte {offset + len(data)}, expected {offset + size}")
+        data += block
+    return bytes(data)
+
+async def async_multipart_upload(key, file_size, part_size, use_acceleration=True, callback=None):
+    """Upload a file as a multipart upload from a single event loop"""
+    ranges = [(start, min(part_size, file_size - start)) for start in range(0, file_size, part_size)]
+    # Every part in flight is held in memory, so bound uploads tighter than downloads
+    semaphore = asyncio.Semaphore(min(ASYNC_MAX_IN_FLIGHT, MAX_IN_MEMORY_UPLOAD_PARTS))
+    loop = asyncio.get_running_loop()
+    fd = os.open(TEST_FILE, os.O_RDONLY)
+    
+    try:
+        async with create_async_client(use_acceleration) as s3_client:
+            response = await s3_client.create_multipart_upload(Bucket=S3_BUCKET, Key=key)
+            upload_id = response['UploadId']
+            
+            async def upload_part(index):
+                offset, size = ranges[index]
+                async with semaphore:
+                    # Read on a worker thread so the event loop keeps sending other parts
+                    data = await loop.run_in_executor(None, read_part, fd, offset, size)
+                    response = await s3_client.upload_part(
+                        Bucket=S3_BUCKET,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=index + 1,
+                        Body=data
+                    )
+                if callback:
+                    callback(size)
+                return {'PartNumber': index + 1, 'ETag': response['ETag']}
+            
+            try:
+                parts = await asyncio.gather(*[upload_part(i) for i in range(len(ranges))])
+                await s3_client.complete_multipart_upload(
+                    Bucket=S3_BUCKET,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts}
+                )
+            except Exception:
+                # Do not leave billed parts behind
+                await s3_client.abort_multipart_upload(Bucket=S3_BUCKET, Key=key, UploadId=upload_id)
+                raise
+    finally:
+        os.close(fd)
+
+async def async_range_download(key, download_path, file_size, part_size, use_acceleration=True, callback=None):
+    """Download an object with ranged GETs multiplexed on a single event loop"""
+    ranges = [(start, min(start + part_size, file_size) - 1) for start in range(0, file_size, part_size)]
+    semaphore = asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+    fd = open_preallocated(download_path, file_size)
+    
+    try:
+        async with create_async_client(use_acceleration) as s3_client:
+            async def download_part(start_byte, end_byte):
+                async with semaphore:
+                    response = await s3_client.get_object(
+                        Bucket=S3_BUCKET,
+                        Key=key,
+                        Range=f"bytes={start_byte}-{end_byte}"
+                    )
+                    
+                    # Stream the body straight to its offset in the output file
+                    offset = start_byte
+                    async for block in response['Body'].iter_chunks(IO_CHUNKSIZE):
+                        os.pwrite(fd, block, offset)
+                        offset += len(block)
+                        if callback:
+                            callback(len(block))
+            
+            await asyncio.gather(*[download_part(start, end) for start, end in ranges])
+    finally:
+        os.close(fd)
+
 def object_exists_in_s3(bucket, key):
     """Check if an object exists in S3"""
     try:
-        s3_client = boto3.client('s3', region_name=REGION)
+        s3_client = get_standard_client()
         s3_client.head_object(Bucket=bucket, Key=key)
         return True
     except ClientError as e:
@@ -279,15 +794,38 @@ def clean_up(bucket):
     """Clean up all created resources"""
     logger.info("Starting cleanup...")
     
-    # Delete objects in S3 bucket
     try:
-        s3 = boto3.resource('s3')
-        bucket_obj = s3.Bucket(bucket)
-        bucket_obj.objects.all().delete()
+        s3_client = get_standard_client()
+        
+        # Abort unfinished multipart uploads first, their parts are billed but never listed as objects
+        paginator = s3_client.get_paginator('list_multipart_uploads')
+        for page in paginator.paginate(Bucket=bucket):
+            for upload in page.get('Uploads', []):
+                s3_client.abort_multipart_upload(
+                    Bucket=bucket,
+                    Key=upload['Key'],
+                    UploadId=upload['UploadId']
+                )
+        logger.info(f"Aborted incomplete multipart uploads in bucket: {bucket}")
+        
+        # Delete objects in S3 bucket, one DeleteObjects call per page of 1000 keys
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = []
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, PaginationConfig={'PageSize': 1000}):
+                keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+                if keys:
+                    futures.append(executor.submit(
+                        s3_client.delete_objects,
+                        Bucket=bucket,
+                        Delete={'Objects': keys, 'Quiet': True}
+                    ))
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
         logger.info(f"Deleted all objects in bucket: {bucket}")
         
         # Delete the bucket
-        bucket_obj.delete()
+        s3_client.delete_bucket(Bucket=bucket)
         logger.info(f"Deleted bucket: {bucket}")
     except ClientError as e:
         logger.error(f"Error cleaning up S3 resources: {e}")
@@ -345,10 +883,29 @@ def generate_report(results, file_size):
     
     # Helper function to calculate averages
     def calculate_averages(test_results):
-        durations = [result['duration'] for result in test_results if result is not None]
-        throughputs = [result['throughput'] for result in test_results if result is not None]
+        count = 0
+        total_duration = 0.0
+        total_throughput = 0.0
+        min_duration = 0
+        max_throughput = 0
         
-        if not durations:
+        # Fold the sums and extremes into a single pass over the results
+        for result in test_results:
+            if result is None:
+                continue
+            duration = result['duration']
+            throughput = result['throughput']
+            if count == 0:
+                min_duration = duration
+                max_throughput = throughput
+            else:
+                min_duration = min(min_duration, duration)
+                max_throughput = max(max_throughput, throughput)
+            total_duration += duration
+            total_throughput += throughput
+            count += 1
+        
+        if not count:
             return {
                 'avg_duration': 0,
                 'avg_throughput': 0,
@@ -357,10 +914,10 @@ def generate_report(results, file_size):
             }
         
         return {
-            'avg_duration': statistics.mean(durations),
-            'avg_throughput': statistics.mean(throughputs),
-            'min_duration': min(durations),
-            'max_throughput': max(throughputs)
+            'avg_duration': total_duration / count,
+            'avg_throughput': total_throughput / count,
+            'min_duration': min_duration,
+            'max_throughput': max_throughput
         }
     
     # Calculate averages for each test type
@@ -373,49 +930,42 @@ def generate_report(results, file_size):
     logger.info(f"{'Test Type':<40} {'Avg Duration (s)':<20} {'Avg Throughput (MB/s)':<20}")
     logger.info("-" * 80)
     
-    for test_name in [
+    test_names = [
         'optimized_upload_without_acceleration',
         'optimized_upload_with_acceleration',
         'optimized_download_without_acceleration',
         'optimized_download_with_acceleration'
-    ]:
+    ]
+    for test_name in test_names:
         avg = averages[test_name]
         logger.info(f"{test_name:<40} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f}")
     
+    # Compare with previous best methods, one loop instead of a block per test
+    comparisons = {}
+    for test_name in test_names:
+        speed = averages[test_name]['avg_throughput']
+        if speed <= 0:
+            continue
+        operation = 'upload' if '_upload_' in test_name else 'download'
+        if test_name.endswith('without_acceleration'):
+            acceleration = 'WITHOUT acceleration'
+        elif all(result['acceleration'] for result in results[test_name] if result is not None):
+            acceleration = 'WITH acceleration'
+        else:
+            acceleration = 'acceleration bypassed (same region)'
+        comparisons[test_name] = {
+            f"vs_{method}": ((speed - baseline) / baseline) * 100
+            for method, baseline in BASELINE_THROUGHPUT[operation].items()
+        }
+        comparisons[test_name]['acceleration'] = acceleration
+        logger.info(f"\nOptimized {operation} {acceleration}: {speed:.2f} MB/s")
     
-    # Calculate improvement percentages
-    upload_no_accel = averages['optimized_upload_without_acceleration']['avg_throughput']
-    upload_with_accel = averages['optimized_upload_with_acceleration']['avg_throughput']
-    download_no_accel = averages['optimized_download_without_acceleration']['avg_throughput']
-    download_with_accel = averages['optimized_download_with_acceleration']['avg_throughput']
-    
-    # Compare with previous best methods
-    if upload_no_accel > 0:
-        vs_crt = ((upload_no_accel - 6.38) / 6.38) * 100
-        vs_direct = ((upload_no_accel - 7.00) / 7.00) * 100
-        vs_datasync = ((upload_no_accel - 15.00) / 15.00) * 100
-        logger.info(f"\nOptimized upload WITHOUT acceleration: {upload_no_accel:.2f} MB/s")
-
-    if upload_with_accel > 0:
-        vs_crt = ((upload_with_accel - 6.38) / 6.38) * 100
-        vs_direct = ((upload_with_accel - 7.00) / 7.00) * 100
-        vs_datasync = ((upload_with_accel - 15.00) / 15.00) * 100
-        logger.info(f"\nOptimized upload WITH acceleration: {upload_with_accel:.2f} MB/s")
-
-    
-    if download_no_accel > 0:
-        vs_crt = ((download_no_accel - 30.90) / 30.90) * 100
-        vs_direct = ((download_no_accel - 7.58) / 7.58) * 100
-        vs_datasync = ((download_no_accel - 18.00) / 18.00) * 100
-        logger.info(f"\nOptimized download WITHOUT acceleration: {download_no_accel:.2f} MB/s")
-
-    
-    if download_with_accel > 0:
-        vs_crt = ((download_with_accel - 30.90) / 30.90) * 100
-        vs_direct = ((download_with_accel - 7.58) / 7.58) * 100
-        vs_datasync = ((download_with_accel - 18.00) / 18.00) * 100
-        logger.info(f"\nOptimized download WITH acceleration: {download_with_accel:.2f} MB/s")
-
+    # Machine-readable summary for scripts that aggregate several runs
+    logger.info(json.dumps({
+        'file_size': file_size,
+        'averages': averages,
+        'comparisons': comparisons
+    }))
     
     logger.info("\n=== END OF REPORT ===\n")
 
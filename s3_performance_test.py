@@ -6,16 +6,23 @@ This script tests AWS S3 upload and download performance with various methods
 including standard uploads, multipart uploads, and transfer acceleration.
 """
 
+import io
 import os
+import mmap
 import time
 import uuid
+import base64
 import boto3
+import hashlib
 import logging
 import threading
-import statistics
+import functools
+import concurrent.futures
+import botocore.session
 from io import BytesIO
 from botocore.exceptions import ClientError
 from boto3.s3.transfer import TransferConfig
+from s3transfer.subscribers import BaseSubscriber
 
 # Configure logging
 logging.basicConfig(
@@ -26,17 +33,62 @@ logger = logging.getLogger(__name__)
 
 # Constants
 REGION = 'us-east-1'  # Change to your preferred region
-CHUNK_SIZE = 100 * 1024 * 1024  # 100MB chunks for multipart upload
 TEST_ITERATIONS = 3
+PARALLEL_UPLOAD_WORKERS = 4  # Upload variants in flight at once during the aggregate pass
+RANGE_DOWNLOAD_PARTS = 16  # Concurrent ranged GETs, each on its own connection
 UNIQUE_ID = str(uuid.uuid4())[:8]
 STANDARD_BUCKET = f"s3-performance-test-standard-{UNIQUE_ID}"
 ACCELERATED_BUCKET = f"s3-performance-test-accelerated-{UNIQUE_ID}"
 TEST_FILE = "test.zip"  # Using existing test.zip file
 TEST_VIDEO = "test.zip"  # Using the same file for download tests
+TEST_FILE_SIZE = os.path.getsize(TEST_FILE) if os.path.exists(TEST_FILE) else 0  # stat() once, not per test
+# Set ALLOW_PLAINTEXT_S3=1 to add a plain HTTP upload variant, only for intra-region test traffic, never over the internet
+ALLOW_PLAINTEXT_S3 = os.environ.get('ALLOW_PLAINTEXT_S3') == '1'
 
-# Create S3 clients
-s3_client = boto3.client('s3', region_name=REGION)
-s3_resource = boto3.resource('s3', region_name=REGION)
+MIN_PART_COUNT = 16
+MAX_PART_COUNT = 1000
+TARGET_PART_SIZE = 16 * 1024 * 1024  # 16 MB
+MIN_PART_SIZE = 8 * 1024 * 1024  # 8 MB
+MAX_CONCURRENCY = 20  # Near the sweet spot for multi-GB files, enough to keep the tail rounds short
+IO_CHUNKSIZE = 1 * 1024 * 1024  # 1 MB reads keep part bodies flowing into the sockets
+# Room for every upload in the parallel pass, and more than RANGE_DOWNLOAD_PARTS + 4
+MAX_POOL_CONNECTIONS = PARALLEL_UPLOAD_WORKERS * MAX_CONCURRENCY
+MAX_RETRY_ATTEMPTS = 10
+
+CRT_THROUGHPUT_TARGET_GBPS = 10.0
+
+# Check if the AWS CRT is installed
+try:
+    import awscrt.auth
+    import awscrt.io
+    import awscrt.s3
+    from s3transfer.crt import BotocoreCRTRequestSerializer, CRTTransferManager
+    CRT_AVAILABLE = True
+except ImportError:
+    CRT_AVAILABLE = False
+    logger.warning("AWS CRT support is not available, multipart uploads will use TransferConfig. Install with: pip install 'boto3[crt]'")
+
+# Create S3 clients once and reuse their connection pools across iterations
+# Adaptive retries back off on 503 SlowDown, keepalive holds idle pooled connections open between tests
+client_config = boto3.session.Config(
+    retries={'mode': 'adaptive', 'max_attempts': MAX_RETRY_ATTEMPTS},
+    tcp_keepalive=True,
+    max_pool_connections=MAX_POOL_CONNECTIONS
+)
+s3_client = boto3.client('s3', region_name=REGION, config=client_config)
+s3_accelerated_client = boto3.client(
+    's3',
+    region_name=REGION,
+    config=client_config.merge(boto3.session.Config(s3={'use_accelerate_endpoint': True}))
+)
+# Plain HTTP client to isolate the cost of TLS, an explicit endpoint_url overrides use_ssl so its scheme has to match
+s3_plain_client = boto3.client(
+    's3',
+    region_name=REGION,
+    use_ssl=False,
+    endpoint_url=f"http://s3.{REGION}.amazonaws.com",
+    config=client_config
+) if ALLOW_PLAINTEXT_S3 else None
 
 
 class ProgressPercentage:
@@ -44,21 +96,95 @@ class ProgressPercentage:
     def __init__(self, size, operation_name):
         self._size = size
         self._seen_so_far = 0
-        self._start_time = time.time()
+        self._start_ns = time.monotonic_ns()
         self._operation_name = operation_name
         self._lock = threading.Lock()
+        self._last_update_ns = 0
+        self._update_interval_ns = 1_000_000_000  # Log at most once per second
+        # Scale factors computed once, so a log line costs two multiplies
+        self._inv_size = 100.0 / size if size else 0.0
+        self._inv_mib = 1.0 / (1024 * 1024)
 
     def __call__(self, bytes_amount):
+        # Hold the lock only for the counter and the time gate
         with self._lock:
             self._seen_so_far += bytes_amount
-            percentage = (self._seen_so_far / self._size) * 100
-            elapsed_time = time.time() - self._start_time
-            speed = self._seen_so_far / (1024 * 1024 * elapsed_time) if elapsed_time > 0 else 0
-            
-            logger.info(
-                f"{self._operation_name}: {self._seen_so_far}/{self._size} "
-                f"({percentage:.2f}%) - {speed:.2f} MB/s"
-            )
+            now_ns = time.monotonic_ns()
+            if now_ns - self._last_update_ns < self._update_interval_ns:
+                return
+            self._last_update_ns = now_ns
+            seen = self._seen_so_far
+        
+        percentage = seen * self._inv_size
+        elapsed_time = (now_ns - self._start_ns) / 1e9
+        speed = seen * self._inv_mib / elapsed_time if elapsed_time > 0 else 0
+        
+        logger.info(
+            f"{self._operation_name}: {seen}/{self._size} "
+            f"({percentage:.2f}%) - {speed:.2f} MB/s"
+        )
+
+
+
+class ProgressSubscriber(BaseSubscriber):
+    """Forward CRT transfer progress to a plain progress callback"""
+    def __init__(self, callback):
+        self._callback = callback
+        
+    def on_progress(self, bytes_transferred, **kwargs):
+        self._callback(bytes_transferred)
+
+
+@functools.lru_cache(maxsize=None)
+def get_crt_bootstrap():
+    """Return the shared CRT bootstrap and credentials, one event loop group for every CRT client"""
+    # TLS, signing and part splitting all run on CRT threads outside the GIL
+    event_loop_group = awscrt.io.EventLoopGroup(os.cpu_count())
+    host_resolver = awscrt.io.DefaultHostResolver(event_loop_group)
+    bootstrap = awscrt.io.ClientBootstrap(event_loop_group, host_resolver)
+    credential_provider = awscrt.auth.AwsCredentialsProvider.new_default_chain(bootstrap)
+    return bootstrap, credential_provider
+
+
+@functools.lru_cache(maxsize=None)
+def get_crt_s3_client(part_size):
+    """Return the shared native CRT S3 client for a part size, built on first use"""
+    bootstrap, credential_provider = get_crt_bootstrap()
+    
+    return awscrt.s3.S3Client(
+        bootstrap=bootstrap,
+        region=REGION,
+        credential_provider=credential_provider,
+        part_size=part_size,
+        multipart_upload_threshold=part_size,
+        throughput_target_gbps=CRT_THROUGHPUT_TARGET_GBPS
+    )
+
+
+@functools.lru_cache(maxsize=2)
+def get_crt_request_serializer(use_acceleration=False):
+    """Return a cached request serializer for the CRT transfer manager"""
+    # botocore serializes the requests, so the accelerate endpoint setting still applies
+    config = boto3.session.Config(s3={'use_accelerate_endpoint': use_acceleration})
+    return BotocoreCRTRequestSerializer(
+        botocore.session.Session(),
+        {'region_name': REGION, 'config': config}
+    )
+
+
+def crt_upload(file_path, bucket, key, file_size, operation_name, use_acceleration=False):
+    """Upload a file through the CRT transfer manager"""
+    # Same size-derived parts as the TransferConfig path, so both avoid a long tail round
+    part_size = get_multipart_config(file_size).multipart_chunksize
+    transfer_manager = CRTTransferManager(get_crt_s3_client(part_size), get_crt_request_serializer(use_acceleration))
+    with transfer_manager:
+        future = transfer_manager.upload(
+            file_path,
+            bucket,
+            key,
+            subscribers=[ProgressSubscriber(ProgressPercentage(file_size, operation_name))]
+        )
+        future.result()
 
 
 def create_buckets():
@@ -124,10 +250,142 @@ def create_buckets():
     return buckets
 
 
-def normal_upload(file_path, bucket, key):
+@functools.lru_cache(maxsize=None)
+def get_multipart_config(file_size):
+    """Build a multipart TransferConfig sized for the file being uploaded"""
+    # Enough parts that max_concurrency workers stay busy until the last round
+    parts = max(MIN_PART_COUNT, min(MAX_PART_COUNT, file_size // TARGET_PART_SIZE))
+    chunk_size = max(MIN_PART_SIZE, file_size // parts)
+    
+    return TransferConfig(
+        multipart_threshold=chunk_size,
+        max_concurrency=MAX_CONCURRENCY,
+        multipart_chunksize=chunk_size,
+        io_chunksize=IO_CHUNKSIZE,
+        use_threads=True
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_streaming_config(part_size):
+    """Build the TransferConfig for ranged streaming downloads once per part size"""
+    return TransferConfig(
+        multipart_chunksize=part_size,
+        max_concurrency=10,
+        io_chunksize=IO_CHUNKSIZE,
+        use_threads=True
+    )
+
+
+class MmapPartReader(io.RawIOBase):
+    """Seekable read-only view of one part of a memory-mapped file"""
+    def __init__(self, mapped_file, offset, size):
+        self._view = memoryview(mapped_file)[offset:offset + size]
+        self._position = 0
+        
+    def readable(self):
+        return True
+        
+    def seekable(self):
+        return True
+        
+    def readinto(self, buffer):
+        # Copy straight from the mapped pages into the caller's buffer
+        count = min(len(buffer), len(self._view) - self._position)
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+        
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, min(offset, len(self._view)))
+        return self._position
+        
+    def tell(self):
+        return self._position
+        
+    def close(self):
+        # Release the export so the mmap itself can be closed
+        self._view.release()
+        super().close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_part_checksums(file_path, part_size):
+    """Hash every part of a file once, shared by all upload variants that use the same part size"""
+    checksums = []
+    # An empty file cannot be mapped and has no parts to hash
+    if os.path.getsize(file_path) == 0:
+        return checksums
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        view = memoryview(mapped_file)
+        try:
+            for start in range(0, len(mapped_file), part_size):
+                digest = hashlib.sha256(view[start:start + part_size]).digest()
+                checksums.append(base64.b64encode(digest).decode('ascii'))
+        finally:
+            view.release()
+    return checksums
+
+
+def mmap_multipart_upload(client, file_path, bucket, key, file_size, config, callback=None):
+    """Upload a file as a multipart upload with every part served from one mmap"""
+    # Files below the threshold (including empty ones, which cannot be mapped) go up in a single PUT
+    if file_size < config.multipart_threshold:
+        with open(file_path, 'rb') as f:
+            client.put_object(Bucket=bucket, Key=key, Body=f)
+        if callback:
+            callback(file_size)
+        return
+    
+    part_size = config.multipart_chunksize
+    ranges = [(start, min(part_size, file_size - start)) for start in range(0, file_size, part_size)]
+    
+    # Supplying each part's SHA256 lets botocore skip its own checksum pass over the body
+    checksums = get_part_checksums(file_path, part_size)
+    
+    response = client.create_multipart_upload(Bucket=bucket, Key=key, ChecksumAlgorithm='SHA256')
+    upload_id = response['UploadId']
+    
+    try:
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            def upload_part(index):
+                offset, size = ranges[index]
+                with MmapPartReader(mapped_file, offset, size) as body:
+                    response = client.upload_part(
+                        Bucket=bucket,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=index + 1,
+                        ContentLength=size,
+                        ChecksumSHA256=checksums[index],
+                        Body=body
+                    )
+                if callback:
+                    callback(size)
+                return {'PartNumber': index + 1, 'ETag': response['ETag'], 'ChecksumSHA256': checksums[index]}
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=config.max_concurrency) as executor:
+                parts = list(executor.map(upload_part, range(len(ranges))))
+        
+        client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+    except Exception:
+        # Do not leave billed parts behind
+        client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+
+def normal_upload(file_path, bucket, key, file_size=TEST_FILE_SIZE):
     """Perform a normal upload using upload_file"""
-    file_size = os.path.getsize(file_path)
-    start_time = time.time()
+    start_ns = time.monotonic_ns()
     
     try:
         s3_client.upload_file(
@@ -137,8 +395,7 @@ def normal_upload(file_path, bucket, key):
             Callback=ProgressPercentage(file_size, "Normal upload")
         )
         
-        end_time = time.time()
-        duration = end_time - start_time
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         throughput = file_size / (1024 * 1024 * duration)
         
         logger.info(f"Normal upload completed in {duration:.2f} seconds")
@@ -153,30 +410,55 @@ def normal_upload(file_path, bucket, key):
         raise
 
 
-def multipart_upload(file_path, bucket, key):
-    """Perform a multipart upload using TransferConfig"""
-    file_size = os.path.getsize(file_path)
-    start_time = time.time()
-    
-    # Configure multipart upload
-    config = TransferConfig(
-        multipart_threshold=CHUNK_SIZE,
-        max_concurrency=10,
-        multipart_chunksize=CHUNK_SIZE,
-        use_threads=True
-    )
+def plain_normal_upload(file_path, bucket, key, file_size=TEST_FILE_SIZE):
+    """Perform a normal upload over plain HTTP to measure the TLS overhead"""
+    start_ns = time.monotonic_ns()
     
     try:
-        s3_client.upload_file(
+        s3_plain_client.upload_file(
             file_path, 
             bucket, 
             key,
-            Config=config,
-            Callback=ProgressPercentage(file_size, "Multipart upload")
+            Callback=ProgressPercentage(file_size, "Plain HTTP upload")
         )
         
-        end_time = time.time()
-        duration = end_time - start_time
+        duration = (time.monotonic_ns() - start_ns) / 1e9
+        throughput = file_size / (1024 * 1024 * duration)
+        
+        logger.info(f"Plain HTTP upload completed in {duration:.2f} seconds")
+        logger.info(f"Throughput: {throughput:.2f} MB/s")
+        
+        return {
+            'duration': duration,
+            'throughput': throughput
+        }
+    except ClientError as e:
+        logger.error(f"Error during plain HTTP upload: {e}")
+        raise
+
+
+def multipart_upload(file_path, bucket, key, file_size=TEST_FILE_SIZE):
+    """Perform a multipart upload using TransferConfig"""
+    start_ns = time.monotonic_ns()
+    
+    try:
+        if CRT_AVAILABLE:
+            crt_upload(file_path, bucket, key, file_size, "Multipart upload")
+        else:
+            # Configure multipart upload
+            config = get_multipart_config(file_size)
+            
+            mmap_multipart_upload(
+                s3_client,
+                file_path,
+                bucket,
+                key,
+                file_size,
+                config,
+                callback=ProgressPercentage(file_size, "Multipart upload")
+            )
+        
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         throughput = file_size / (1024 * 1024 * duration)
         
         logger.info(f"Multipart upload completed in {duration:.2f} seconds")
@@ -191,45 +473,35 @@ def multipart_upload(file_path, bucket, key):
         raise
 
 
-def accelerated_upload(file_path, bucket, key, use_multipart=False):
+def accelerated_upload(file_path, bucket, key, use_multipart=False, file_size=TEST_FILE_SIZE):
     """Perform an upload with transfer acceleration"""
-    file_size = os.path.getsize(file_path)
-    start_time = time.time()
-    
-    # Create accelerated client
-    s3_accelerated = boto3.client(
-        's3',
-        region_name=REGION,
-        config=boto3.session.Config(s3={'use_accelerate_endpoint': True})
-    )
+    start_ns = time.monotonic_ns()
     
     try:
-        if use_multipart:
+        if use_multipart and CRT_AVAILABLE:
+            crt_upload(file_path, bucket, key, file_size, "Accelerated multipart upload", use_acceleration=True)
+        elif use_multipart:
             # Configure multipart upload
-            config = TransferConfig(
-                multipart_threshold=CHUNK_SIZE,
-                max_concurrency=10,
-                multipart_chunksize=CHUNK_SIZE,
-                use_threads=True
-            )
+            config = get_multipart_config(file_size)
             
-            s3_accelerated.upload_file(
-                file_path, 
-                bucket, 
+            mmap_multipart_upload(
+                s3_accelerated_client,
+                file_path,
+                bucket,
                 key,
-                Config=config,
-                Callback=ProgressPercentage(file_size, "Accelerated multipart upload")
+                file_size,
+                config,
+                callback=ProgressPercentage(file_size, "Accelerated multipart upload")
             )
         else:
-            s3_accelerated.upload_file(
+            s3_accelerated_client.upload_file(
                 file_path, 
                 bucket, 
                 key,
                 Callback=ProgressPercentage(file_size, "Accelerated normal upload")
             )
         
-        end_time = time.time()
-        duration = end_time - start_time
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         throughput = file_size / (1024 * 1024 * duration)
         
         upload_type = "multipart" if use_multipart else "normal"
@@ -245,17 +517,24 @@ def accelerated_upload(file_path, bucket, key, use_multipart=False):
         raise
 
 
-def direct_download_to_memory(bucket, key):
+def direct_download_to_memory(bucket, key, known_size=None):
     """Download file directly to memory using BytesIO"""
     try:
-        # Get object size first
-        response = s3_client.head_object(Bucket=bucket, Key=key)
-        file_size = response['ContentLength']
+        # Get object size first, unless the caller already knows it
+        if known_size is None:
+            response = s3_client.head_object(Bucket=bucket, Key=key)
+            file_size = response['ContentLength']
+        else:
+            file_size = known_size
         
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
-        # Download to memory
+        # Download to memory, sizing the buffer up front so out-of-order parts never regrow it
         buffer = BytesIO()
+        if file_size:
+            buffer.seek(file_size - 1)
+            buffer.write(b'\0')
+            buffer.seek(0)
         s3_client.download_fileobj(
             bucket, 
             key, 
@@ -263,8 +542,7 @@ def direct_download_to_memory(bucket, key):
             Callback=ProgressPercentage(file_size, "Direct memory download")
         )
         
-        end_time = time.time()
-        duration = end_time - start_time
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         throughput = file_size / (1024 * 1024 * duration)
         
         logger.info(f"Direct memory download completed in {duration:.2f} seconds")
@@ -280,38 +558,31 @@ def direct_download_to_memory(bucket, key):
         raise
 
 
-def streaming_download(bucket, key, buffer_size=8 * 1024 * 1024):  # 8MB buffer
-    """Download file using streaming with a specified buffer size"""
+def streaming_download(bucket, key, buffer_size=8 * 1024 * 1024, known_size=None):  # 8MB buffer
+    """Download file using parallel ranged GETs streamed to a discarding sink"""
     try:
-        # Get object size first
-        response = s3_client.head_object(Bucket=bucket, Key=key)
-        file_size = response['ContentLength']
-        
-        start_time = time.time()
+        # Get object size first, unless the caller already knows it
+        if known_size is None:
+            response = s3_client.head_object(Bucket=bucket, Key=key)
+            file_size = response['ContentLength']
+        else:
+            file_size = known_size
         
-        # Stream the download
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        stream = response['Body']
+        start_ns = time.monotonic_ns()
         
-        # Read in chunks to simulate streaming
-        total_read = 0
-        buffer = BytesIO()
+        # Let s3transfer fetch ranged parts in parallel and write them straight
+        # to the sink, instead of copying each chunk through Python
+        config = get_streaming_config(buffer_size)
+        with open(os.devnull, 'wb') as sink:
+            s3_client.download_fileobj(
+                bucket,
+                key,
+                sink,
+                Config=config,
+                Callback=ProgressPercentage(file_size, "Streaming download")
+            )
         
-        while True:
-            chunk = stream.read(buffer_size)
-            if not chunk:
-                break
-            buffer.write(chunk)
-            total_read += len(chunk)
-            
-            # Log progress
-            percentage = (total_read / file_size) * 100
-            elapsed = time.time() - start_time
-            speed = total_read / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-            logger.info(f"Streaming download: {total_read}/{file_size} ({percentage:.2f}%) - {speed:.2f} MB/s")
-        
-        end_time = time.time()
-        duration = end_time - start_time
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         throughput = file_size / (1024 * 1024 * duration)
         
         logger.info(f"Streaming download completed in {duration:.2f} seconds")
@@ -327,6 +598,67 @@ def streaming_download(bucket, key, buffer_size=8 * 1024 * 1024):  # 8MB buffer
         raise
 
 
+def range_download_to_memory(bucket, key, known_size=None, parts=RANGE_DOWNLOAD_PARTS):
+    """Download file into memory with concurrent ranged GETs, one connection per range"""
+    try:
+        # Get object size first, unless the caller already knows it
+        if known_size is None:
+            response = s3_client.head_object(Bucket=bucket, Key=key)
+            file_size = response['ContentLength']
+        else:
+            file_size = known_size
+        
+        start_ns = time.monotonic_ns()
+        
+        # Every range lands at its own offset in one buffer sized up front
+        buffer = bytearray(file_size)
+        view = memoryview(buffer)
+        chunk_size = max(1, -(-file_size // parts))  # Ceiling division
+        progress = ProgressPercentage(file_size, "Range download")
+        
+        def fetch(start_byte, end_byte):
+            body = s3_client.get_object(
+                Bucket=bucket,
+                Key=key,
+                Range=f"bytes={start_byte}-{end_byte}"
+            )['Body']
+            
+            # Copy each block into its slice of the buffer through the public StreamingBody API
+            offset = start_byte
+            while offset <= end_byte:
+                chunk = body.read(min(IO_CHUNKSIZE, end_byte + 1 - offset))
+                if not chunk:
+                    break
+                count = len(chunk)
+                view[offset:offset + count] = chunk
+                offset += count
+                progress(count)
+            
+            if offset <= end_byte:
+                raise IOError(f"Range {start_byte}-{end_byte} ended early at byte {offset}")
+        
+        ranges = [(start, min(file_size, start + chunk_size) - 1) for start in range(0, file_size, chunk_size)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=parts) as executor:
+            futures = [executor.submit(fetch, start, end) for start, end in ranges]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        
+        duration = (time.monotonic_ns() - start_ns) / 1e9
+        throughput = file_size / (1024 * 1024 * duration)
+        
+        logger.info(f"Range download completed in {duration:.2f} seconds")
+        logger.info(f"Throughput: {throughput:.2f} MB/s")
+        
+        return {
+            'duration': duration,
+            'throughput': throughput,
+            'data_size': file_size
+        }
+    except ClientError as e:
+        logger.error(f"Error during range download: {e}")
+        raise
+
+
 def clean_up(buckets, local_files):
     """Clean up all created resources"""
     logger.info("Starting cleanup...")
@@ -343,11 +675,29 @@ def clean_up(buckets, local_files):
     # Delete buckets and their contents
     for bucket_name in buckets:
         try:
-            bucket = s3_resource.Bucket(bucket_name)
-            bucket.objects.all().delete()
+            # Abort unfinished multipart uploads first, their parts are billed but never listed as objects
+            paginator = s3_client.get_paginator('list_multipart_uploads')
+            for page in paginator.paginate(Bucket=bucket_name):
+                for upload in page.get('Uploads', []):
+                    s3_client.abort_multipart_upload(
+                        Bucket=bucket_name,
+                        Key=upload['Key'],
+                        UploadId=upload['UploadId']
+                    )
+            logger.info(f"Aborted incomplete multipart uploads in bucket: {bucket_name}")
+            
+            # One DeleteObjects call per page of up to 1000 keys
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket_name, PaginationConfig={'PageSize': 1000}):
+                keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+                if keys:
+                    s3_client.delete_objects(
+                        Bucket=bucket_name,
+                        Delete={'Objects': keys, 'Quiet': True}
+                    )
             logger.info(f"Deleted all objects in bucket: {bucket_name}")
             
-            bucket.delete()
+            s3_client.delete_bucket(Bucket=bucket_name)
             logger.info(f"Deleted bucket: {bucket_name}")
         except ClientError as e:
             logger.error(f"Error deleting bucket {bucket_name}: {e}")
@@ -355,20 +705,74 @@ def clean_up(buckets, local_files):
     logger.info("Cleanup completed")
 
 
+def parallel_upload_pass(file_path, file_size=TEST_FILE_SIZE):
+    """Run every upload variant for every iteration concurrently and measure aggregate throughput"""
+    jobs = []
+    for i in range(TEST_ITERATIONS):
+        jobs.append((normal_upload, (file_path, STANDARD_BUCKET, f"parallel_normal_upload_{i}.bin")))
+        jobs.append((multipart_upload, (file_path, STANDARD_BUCKET, f"parallel_multipart_upload_{i}.bin")))
+        jobs.append((accelerated_upload, (file_path, ACCELERATED_BUCKET, f"parallel_acc_normal_upload_{i}.bin", False)))
+        jobs.append((accelerated_upload, (file_path, ACCELERATED_BUCKET, f"parallel_acc_multipart_upload_{i}.bin", True)))
+    
+    start_ns = time.monotonic_ns()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=PARALLEL_UPLOAD_WORKERS) as executor:
+        futures = [executor.submit(fn, *args) for fn, args in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+    
+    duration = (time.monotonic_ns() - start_ns) / 1e9
+    total_bytes = file_size * len(jobs)
+    throughput = total_bytes / (1024 * 1024 * duration)
+    
+    logger.info(f"Parallel upload pass of {len(jobs)} uploads completed in {duration:.2f} seconds")
+    logger.info(f"Aggregate throughput: {throughput:.2f} MB/s")
+    
+    return {
+        'duration': duration,
+        'throughput': throughput
+    }
+
+
 def generate_report(results):
     """Generate a summary report of all test results"""
     logger.info("\n\n=== S3 PERFORMANCE TEST SUMMARY ===\n")
     
     # Helper function to calculate averages
     def calculate_averages(test_results):
-        durations = [result['duration'] for result in test_results]
-        throughputs = [result['throughput'] for result in test_results]
+        count = 0
+        total_duration = 0.0
+        total_throughput = 0.0
+        min_duration = 0
+        max_throughput = 0
+        
+        # Fold the sums and extremes into a single pass over the results
+        for result in test_results:
+            duration = result['duration']
+            throughput = result['throughput']
+            if count == 0:
+                min_duration = duration
+                max_throughput = throughput
+            else:
+                min_duration = min(min_duration, duration)
+                max_throughput = max(max_throughput, throughput)
+            total_duration += duration
+            total_throughput += throughput
+            count += 1
+        
+        # plain_normal_upload stays empty unless ALLOW_PLAINTEXT_S3 is set
+        if not count:
+            return {
+                'avg_duration': 0,
+                'avg_throughput': 0,
+                'min_duration': 0,
+                'max_throughput': 0
+            }
         
         return {
-            'avg_duration': statistics.mean(durations),
-            'avg_throughput': statistics.mean(throughputs),
-            'min_duration': min(durations),
-            'max_throughput': max(throughputs)
+            'avg_duration': total_duration / count,
+            'avg_throughput': total_throughput / count,
+            'min_duration': min_duration,
+            'max_throughput': max_throughput
         }
     
     # Calculate averages for each test type
@@ -386,15 +790,25 @@ def generate_report(results):
         avg = averages[test_name]
         logger.info(f"{test_name:<30} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f} {avg['max_throughput']:<20.2f}")
     
+    if results.get('plain_normal_upload'):
+        avg = averages['plain_normal_upload']
+        logger.info(f"{'plain_normal_upload':<30} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f} {avg['max_throughput']:<20.2f}")
+    
     # Print download test results
     logger.info("\nDOWNLOAD PERFORMANCE (test.zip):")
     logger.info(f"{'Test Type':<30} {'Avg Duration (s)':<20} {'Avg Throughput (MB/s)':<20} {'Best Throughput (MB/s)':<20}")
     logger.info("-" * 90)
     
-    for test_name in ['direct_memory_download', 'streaming_download']:
+    for test_name in ['direct_memory_download', 'streaming_download', 'range_download']:
         avg = averages[test_name]
         logger.info(f"{test_name:<30} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f} {avg['max_throughput']:<20.2f}")
     
+    # Print aggregate throughput of the concurrent pass
+    if results.get('parallel_upload_aggregate'):
+        avg = averages['parallel_upload_aggregate']
+        logger.info("\nPARALLEL UPLOAD PASS (all variants concurrently):")
+        logger.info(f"{'parallel_upload_aggregate':<30} {avg['avg_duration']:<20.2f} {avg['avg_throughput']:<20.2f} {avg['max_throughput']:<20.2f}")
+    
     # Determine best methods
     best_upload = max(
         ['standard_normal_upload', 'standard_multipart_upload', 
@@ -403,7 +817,7 @@ def generate_report(results):
     )
     
     best_download = max(
-        ['direct_memory_download', 'streaming_download'],
+        ['direct_memory_download', 'streaming_download', 'range_download'],
         key=lambda x: averages[x]['avg_throughput']
     )
     
@@ -418,6 +832,14 @@ def generate_report(results):
         improvement = ((accelerated_mp - standard) / standard) * 100
         logger.info(f"\nImprovement from Standard Upload to Accelerated Multipart: {improvement:.2f}%")
     
+    # Same upload with and without TLS, the difference is the encryption cost
+    if results.get('plain_normal_upload'):
+        standard = averages['standard_normal_upload']['avg_throughput']
+        plain = averages['plain_normal_upload']['avg_throughput']
+        if standard > 0:
+            overhead = ((plain - standard) / standard) * 100
+            logger.info(f"Plain HTTP upload vs TLS upload: {overhead:.2f}%")
+    
     logger.info("\n=== END OF REPORT ===\n")
 
 
@@ -428,10 +850,13 @@ def run_tests():
     results = {
         'standard_normal_upload': [],
         'standard_multipart_upload': [],
+        'plain_normal_upload': [],
         'accelerated_normal_upload': [],
         'accelerated_multipart_upload': [],
         'direct_memory_download': [],
-        'streaming_download': []
+        'streaming_download': [],
+        'range_download': [],
+        'parallel_upload_aggregate': []
     }
     
     try:
@@ -443,9 +868,14 @@ def run_tests():
             logger.error(f"Test file {TEST_FILE} not found. Please ensure it exists in the current directory.")
             return
         
-        file_size = os.path.getsize(TEST_FILE)
+        file_size = TEST_FILE_SIZE
         logger.info(f"Using existing test file: {TEST_FILE} ({file_size / (1024**3):.2f} GB)")
         
+        # Hash the multipart parts once up front, outside every timed upload
+        multipart_config = get_multipart_config(file_size)
+        if not CRT_AVAILABLE and file_size >= multipart_config.multipart_threshold:
+            get_part_checksums(TEST_FILE, multipart_config.multipart_chunksize)
+        
         # Upload test file to standard bucket for download tests
         logger.info("Uploading test file for download tests")
         s3_client.upload_file(TEST_FILE, STANDARD_BUCKET, TEST_VIDEO)
@@ -462,6 +892,10 @@ def run_tests():
             results['standard_multipart_upload'].append(
                 multipart_upload(TEST_FILE, STANDARD_BUCKET, f"multipart_upload_{i}.bin")
             )
+            if ALLOW_PLAINTEXT_S3:
+                results['plain_normal_upload'].append(
+                    plain_normal_upload(TEST_FILE, STANDARD_BUCKET, f"plain_normal_upload_{i}.bin")
+                )
             
             # Accelerated bucket tests
             logger.info("\n=== Accelerated Bucket Tests ===\n")
@@ -475,11 +909,18 @@ def run_tests():
             # Download tests
             logger.info("\n=== Download Tests ===\n")
             results['direct_memory_download'].append(
-                direct_download_to_memory(STANDARD_BUCKET, TEST_VIDEO)
+                direct_download_to_memory(STANDARD_BUCKET, TEST_VIDEO, known_size=file_size)
             )
             results['streaming_download'].append(
-                streaming_download(STANDARD_BUCKET, TEST_VIDEO)
+                streaming_download(STANDARD_BUCKET, TEST_VIDEO, known_size=file_size)
             )
+            results['range_download'].append(
+                range_download_to_memory(STANDARD_BUCKET, TEST_VIDEO, known_size=file_size)
+            )
+        
+        # Overlap independent uploads to measure aggregate throughput, the serial pass above keeps per-variant timing
+        logger.info("\n=== Parallel Upload Pass ===\n")
+        results['parallel_upload_aggregate'].append(parallel_upload_pass(TEST_FILE))
         
         # Generate summary report
         generate_report(results)
@@ -9,12 +9,16 @@ for transferring files between local storage and S3.
 import os
 import time
 import uuid
+import asyncio
 import boto3
 import logging
 import threading
-import statistics
+import functools
+import botocore.session
 from datetime import datetime
 from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from s3transfer.subscribers import BaseSubscriber
 
 # Configure logging
 logging.basicConfig(
@@ -29,10 +33,52 @@ UNIQUE_ID = str(uuid.uuid4())[:8]
 S3_BUCKET = f"s3-transfer-test-{UNIQUE_ID}"
 TEST_FILE = "test.zip"
 LOCAL_PATH = os.path.abspath(TEST_FILE)
+TEST_FILE_SIZE = os.path.getsize(TEST_FILE) if os.path.exists(TEST_FILE) else 0  # stat() once, not per test
 S3_PREFIX = "transfer-test"
+MIN_PART_COUNT = 16
+MAX_PART_COUNT = 1000
+TARGET_PART_SIZE = 16 * 1024 * 1024  # 16 MB
+MIN_PART_SIZE = 8 * 1024 * 1024  # 8 MB
+MAX_CONCURRENCY = 20  # Near the sweet spot for multi-GB files, enough to keep the tail rounds short
+IO_CHUNKSIZE = 1 * 1024 * 1024  # 1 MB reads keep part bodies flowing into the sockets
+MAX_POOL_CONNECTIONS = 64  # At least the TransferConfig max_concurrency
+MAX_RETRY_ATTEMPTS = 10
+CRT_THROUGHPUT_TARGET_GBPS = 10.0
+
+# Set USE_ASYNC=1 to upload parts from one asyncio event loop with aioboto3 instead of threads
+USE_ASYNC = os.environ.get('USE_ASYNC') == '1'
+
+# Check if the AWS CRT is installed
+try:
+    import awscrt.auth
+    import awscrt.io
+    import awscrt.s3
+    from s3transfer.crt import BotocoreCRTRequestSerializer, CRTTransferManager
+    CRT_AVAILABLE = True
+except ImportError:
+    CRT_AVAILABLE = False
+    logger.warning("AWS CRT support is not available, transfers will use TransferConfig. Install with: pip install 'boto3[crt]'")
+
+# Check if aioboto3 is installed
+try:
+    import aioboto3
+    AIOBOTO3_AVAILABLE = True
+except ImportError:
+    AIOBOTO3_AVAILABLE = False
+    if USE_ASYNC:
+        logger.warning("aioboto3 is not available, USE_ASYNC is ignored. Install with: pip install aioboto3")
 
 # Create AWS clients
-s3_client = boto3.client('s3', region_name=REGION)
+# Adaptive retries back off on 503 SlowDown, keepalive holds idle pooled connections open between tests
+s3_client = boto3.client(
+    's3',
+    region_name=REGION,
+    config=boto3.session.Config(
+        retries={'mode': 'adaptive', 'max_attempts': MAX_RETRY_ATTEMPTS},
+        tcp_keepalive=True,
+        max_pool_connections=MAX_POOL_CONNECTIONS
+    )
+)
 
 def create_bucket():
     """Create S3 bucket for testing"""
@@ -50,57 +96,186 @@ def create_bucket():
         logger.error(f"Error creating bucket: {e}")
         raise
 
-def s3_transfer_manager_upload():
+@functools.lru_cache(maxsize=None)
+def get_crt_bootstrap():
+    """Return the shared CRT bootstrap and credentials, one event loop group for every CRT client"""
+    # TLS, signing and part splitting all run on CRT threads outside the GIL
+    event_loop_group = awscrt.io.EventLoopGroup(os.cpu_count())
+    host_resolver = awscrt.io.DefaultHostResolver(event_loop_group)
+    bootstrap = awscrt.io.ClientBootstrap(event_loop_group, host_resolver)
+    credential_provider = awscrt.auth.AwsCredentialsProvider.new_default_chain(bootstrap)
+    return bootstrap, credential_provider
+
+@functools.lru_cache(maxsize=None)
+def create_crt_transfer_manager(part_size):
+    """Return a shared transfer manager backed by the native AWS CRT S3 client for a part size"""
+    bootstrap, credential_provider = get_crt_bootstrap()
+    
+    crt_s3_client = awscrt.s3.S3Client(
+        bootstrap=bootstrap,
+        region=REGION,
+        credential_provider=credential_provider,
+        part_size=part_size,
+        multipart_upload_threshold=part_size,
+        throughput_target_gbps=CRT_THROUGHPUT_TARGET_GBPS
+    )
+    
+    # botocore is only used to serialize the requests handed to the CRT
+    request_serializer = BotocoreCRTRequestSerializer(
+        botocore.session.Session(),
+        {'region_name': REGION}
+    )
+    return CRTTransferManager(crt_s3_client, request_serializer)
+
+@functools.lru_cache(maxsize=None)
+def get_transfer_config(file_size):
+    """Build a TransferConfig sized for the file being transferred"""
+    # Enough parts that max_concurrency workers stay busy until the last round
+    parts = max(MIN_PART_COUNT, min(MAX_PART_COUNT, file_size // TARGET_PART_SIZE))
+    chunk_size = max(MIN_PART_SIZE, file_size // parts)
+    
+    return TransferConfig(
+        multipart_threshold=chunk_size,
+        max_concurrency=MAX_CONCURRENCY,
+        multipart_chunksize=chunk_size,
+        io_chunksize=IO_CHUNKSIZE,
+        use_threads=True
+    )
+
+class ProgressSubscriber(BaseSubscriber):
+    """Forward CRT transfer progress to a plain progress callback"""
+    def __init__(self, callback):
+        self._callback = callback
+        
+    def on_progress(self, bytes_transferred, **kwargs):
+        self._callback(bytes_transferred)
+
+def read_part(fd, offset, size):
+    """Read exactly size bytes at offset, pread may return fewer than requested"""
+    data = bytearray()
+    while len(data) < size:
+        block = os.pread(fd, size - len(data), offset + len(data))
+        if not block:
+            raise IOError(f"{TEST_FILE} ended at byte {offset + len(data)}, expected {offset + size}")
+        data += block
+    return bytes(data)
+
+async def async_multipart_upload(key, file_size, part_size, callback=None):
+    """Upload a file as a multipart upload from a single event loop"""
+    ranges = [(start, min(part_size, file_size - start)) for start in range(0, file_size, part_size)]
+    # Parts are read only once they hold a slot, so at most MAX_CONCURRENCY bodies are in memory
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    fd = os.open(TEST_FILE, os.O_RDONLY)
+    config = boto3.session.Config(
+        retries={'mode': 'adaptive', 'max_attempts': MAX_RETRY_ATTEMPTS},
+        tcp_keepalive=True,
+        max_pool_connections=MAX_CONCURRENCY
+    )
+    
+    try:
+        async with aioboto3.Session().client('s3', region_name=REGION, config=config) as s3:
+            response = await s3.create_multipart_upload(Bucket=S3_BUCKET, Key=key)
+            upload_id = response['UploadId']
+            
+            async def upload_part(index):
+                offset, size = ranges[index]
+                async with semaphore:
+                    # Read on a worker thread so the event loop keeps sending other parts
+                    data = await loop.run_in_executor(None, read_part, fd, offset, size)
+                    response = await s3.upload_part(
+                        Bucket=S3_BUCKET,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=index + 1,
+                        Body=data
+                    )
+                if callback:
+                    callback(size)
+                return {'PartNumber': index + 1, 'ETag': response['ETag']}
+            
+            try:
+                parts = await asyncio.gather(*[upload_part(i) for i in range(len(ranges))])
+                await s3.complete_multipart_upload(
+                    Bucket=S3_BUCKET,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts}
+                )
+            except Exception:
+                # Do not leave billed parts behind
+                await s3.abort_multipart_upload(Bucket=S3_BUCKET, Key=key, UploadId=upload_id)
+                raise
+    finally:
+        os.close(fd)
+
+class ProgressPercentage(object):
+    """Print transfer progress at most once per second"""
+    __slots__ = ('_size', '_label', '_start_time', '_seen_so_far', '_lock', '_last_update_time', '_update_interval')
+    
+    def __init__(self, total_size, label, start_time):
+        self._size = total_size
+        self._label = label
+        self._start_time = start_time
+        self._seen_so_far = 0
+        self._lock = threading.Lock()
+        self._last_update_time = time.time()
+        self._update_interval = 1.0  # Update every second
+        
+    def __call__(self, bytes_amount):
+        with self._lock:
+            self._seen_so_far += bytes_amount
+            current_time = time.time()
+            
+            # Update status at regular intervals
+            if current_time - self._last_update_time < self._update_interval:
+                return
+            self._last_update_time = current_time
+            seen = self._seen_so_far
+        
+        percentage = (seen / self._size) * 100
+        elapsed = current_time - self._start_time
+        speed = seen / (1024 * 1024 * elapsed) if elapsed > 0 else 0
+        
+        print(f"\r[{self._label}] Progress: {seen}/{self._size} bytes "
+              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
+
+def s3_transfer_manager_upload(file_size=TEST_FILE_SIZE):
     """Perform an upload using S3 Transfer Manager with optimized settings"""
-    file_size = os.path.getsize(TEST_FILE)
     start_time = time.time()
     
     try:
         logger.info(f"Starting S3 Transfer Manager upload of {TEST_FILE} ({file_size / (1024**2):.2f} MB)")
         
-        # Create a callback class to track upload progress
-        class ProgressPercentage(object):
-            def __init__(self, filename):
-                self._filename = filename
-                self._size = float(os.path.getsize(filename))
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
-                
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[S3 TRANSFER MANAGER UPLOAD] Progress: {self._seen_so_far}/{self._size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
+        # Configure the transfer with settings sized for this file
+        config = get_transfer_config(file_size)
         
-        # Configure the transfer with optimized settings
-        from boto3.s3.transfer import TransferConfig
-        config = TransferConfig(
-            multipart_threshold=8 * 1024 * 1024,  # 8 MB
-            max_concurrency=10,
-            multipart_chunksize=8 * 1024 * 1024,  # 8 MB
-            use_threads=True
-        )
-        
-        # Use the transfer manager to upload the file
-        s3_client.upload_file(
-            TEST_FILE, 
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}",
-            Config=config,
-            Callback=ProgressPercentage(TEST_FILE)
-        )
+        if USE_ASYNC and AIOBOTO3_AVAILABLE:
+            # Overlap the part uploads as coroutines instead of OS threads
+            asyncio.run(async_multipart_upload(
+                f"{S3_PREFIX}/{TEST_FILE}",
+                file_size,
+                config.multipart_chunksize,
+                callback=ProgressPercentage(file_size, 'S3 TRANSFER MANAGER UPLOAD', start_time)
+            ))
+        elif CRT_AVAILABLE:
+            # Let the native CRT client split and send the parts
+            future = create_crt_transfer_manager(config.multipart_chunksize).upload(
+                TEST_FILE,
+                S3_BUCKET,
+                f"{S3_PREFIX}/{TEST_FILE}",
+                subscribers=[ProgressSubscriber(ProgressPercentage(file_size, 'S3 TRANSFER MANAGER UPLOAD', start_time))]
+            )
+            future.result()
+        else:
+            # Use the transfer manager to upload the file
+            s3_client.upload_file(
+                TEST_FILE, 
+                S3_BUCKET, 
+                f"{S3_PREFIX}/{TEST_FILE}",
+                Config=config,
+                Callback=ProgressPercentage(file_size, 'S3 TRANSFER MANAGER UPLOAD', start_time)
+            )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -136,48 +311,27 @@ def s3_transfer_manager_download():
     try:
         logger.info(f"Starting S3 Transfer Manager download to {download_path} ({file_size / (1024**2):.2f} MB)")
         
-        # Create a callback class to track download progress
-        class ProgressPercentage(object):
-            def __init__(self, total_size):
-                self._total_size = total_size
-                self._seen_so_far = 0
-                self._lock = threading.Lock()
-                self._last_update_time = time.time()
-                self._update_interval = 1.0  # Update every second
-                
-            def __call__(self, bytes_amount):
-                with self._lock:
-                    self._seen_so_far += bytes_amount
-                    current_time = time.time()
-                    
-                    # Update status at regular intervals
-                    if current_time - self._last_update_time >= self._update_interval:
-                        percentage = (self._seen_so_far / self._total_size) * 100
-                        elapsed = current_time - start_time
-                        speed = self._seen_so_far / (1024 * 1024 * elapsed) if elapsed > 0 else 0
-                        
-                        print(f"\r[S3 TRANSFER MANAGER DOWNLOAD] Progress: {self._seen_so_far}/{self._total_size} bytes "
-                              f"({percentage:.2f}%) - {speed:.2f} MB/s", end="", flush=True)
-                        
-                        self._last_update_time = current_time
+        # Configure the transfer with settings sized for this file
+        config = get_transfer_config(file_size)
         
-        # Configure the transfer with optimized settings
-        from boto3.s3.transfer import TransferConfig
-        config = TransferConfig(
-            multipart_threshold=8 * 1024 * 1024,  # 8 MB
-            max_concurrency=10,
-            multipart_chunksize=8 * 1024 * 1024,  # 8 MB
-            use_threads=True
-        )
-        
-        # Use the transfer manager to download the file
-        s3_client.download_file(
-            S3_BUCKET, 
-            f"{S3_PREFIX}/{TEST_FILE}", 
-            download_path,
-            Config=config,
-            Callback=ProgressPercentage(file_size)
-        )
+        if CRT_AVAILABLE:
+            # Let the native CRT client fetch the parts
+            future = create_crt_transfer_manager(config.multipart_chunksize).download(
+                S3_BUCKET,
+                f"{S3_PREFIX}/{TEST_FILE}",
+                download_path,
+                subscribers=[ProgressSubscriber(ProgressPercentage(file_size, 'S3 TRANSFER MANAGER DOWNLOAD', start_time))]
+            )
+            future.result()
+        else:
+            # Use the transfer manager to download the file
+            s3_client.download_file(
+                S3_BUCKET, 
+                f"{S3_PREFIX}/{TEST_FILE}", 
+                download_path,
+                Config=config,
+                Callback=ProgressPercentage(file_size, 'S3 TRANSFER MANAGER DOWNLOAD', start_time)
+            )
         
         print()  # Add a newline after progress tracking
         end_time = time.time()
@@ -210,15 +364,31 @@ def clean_up(bucket):
     """Clean up all created resources"""
     logger.info("Starting cleanup...")
     
-    # Delete objects in S3 bucket
     try:
-        s3 = boto3.resource('s3')
-        bucket_obj = s3.Bucket(bucket)
-        bucket_obj.objects.all().delete()
+        # Abort unfinished multipart uploads first, their parts are billed but never listed as objects
+        paginator = s3_client.get_paginator('list_multipart_uploads')
+        for page in paginator.paginate(Bucket=bucket):
+            for upload in page.get('Uploads', []):
+                s3_client.abort_multipart_upload(
+                    Bucket=bucket,
+                    Key=upload['Key'],
+                    UploadId=upload['UploadId']
+                )
+        logger.info(f"Aborted incomplete multipart uploads in bucket: {bucket}")
+        
+        # Delete objects in S3 bucket, one DeleteObjects call per page of 1000 keys
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, PaginationConfig={'PageSize': 1000}):
+            keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if keys:
+                s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={'Objects': keys, 'Quiet': True}
+                )
         logger.info(f"Deleted all objects in bucket: {bucket}")
         
         # Delete the bucket
-        bucket_obj.delete()
+        s3_client.delete_bucket(Bucket=bucket)
         logger.info(f"Deleted bucket: {bucket}")
     except ClientError as e:
         logger.error(f"Error cleaning up S3 resources: {e}")
@@ -238,7 +408,7 @@ def run_tests():
             logger.error(f"Test file {TEST_FILE} not found. Please ensure it exists in the current directory.")
             return
         
-        file_size = os.path.getsize(TEST_FILE)
+        file_size = TEST_FILE_SIZE
         logger.info(f"Using test file: {TEST_FILE} ({file_size / (1024**3):.2f} GB)")
         
         # Create S3 bucket
@@ -267,10 +437,29 @@ def generate_report(results, file_size):
     
     # Helper function to calculate averages
     def calculate_averages(test_results):
-        durations = [result['duration'] for result in test_results if result is not None]
-        throughputs = [result['throughput'] for result in test_results if result is not None]
+        count = 0
+        total_duration = 0.0
+        total_throughput = 0.0
+        min_duration = 0
+        max_throughput = 0
+        
+        # Fold the sums and extremes into a single pass over the results
+        for result in test_results:
+            if result is None:
+                continue
+            duration = result['duration']
+            throughput = result['throughput']
+            if count == 0:
+                min_duration = duration
+                max_throughput = throughput
+            else:
+                min_duration = min(min_duration, duration)
+                max_throughput = max(max_throughput, throughput)
+            total_duration += duration
+            total_throughput += throughput
+            count += 1
         
-        if not durations:
+        if not count:
             return {
                 'avg_duration': 0,
                 'avg_throughput': 0,
@@ -279,10 +468,10 @@ def generate_report(results, file_size):
             }
         
         return {
-            'avg_duration': statistics.mean(durations),
-            'avg_throughput': statistics.mean(throughputs),
-            'min_duration': min(durations),
-            'max_throughput': max(throughputs)
+            'avg_duration': total_duration / count,
+            'avg_throughput': total_throughput / count,
+            'min_duration': min_duration,
+            'max_throughput': max_throughput
         }
     
     # Calculate averages for each test type